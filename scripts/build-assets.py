@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script fingerprints the static assets and writes gzip (and brotli, if installed) variants next to them.
+"""
+
+import sys
+import os
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+from services.assets import build_assets, brotli
+
+if __name__ == "__main__":
+    manifest = build_assets(Config.STATIC_PATH, Config.ASSETS_PATH)
+    for asset, hashed in manifest.items():
+        print(f"+ {asset} -> {hashed}")
+
+    if brotli is None:
+        print("- brotli is not installed, only gzip variants were written")
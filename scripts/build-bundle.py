@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script packs connector sources into a versioned bundle (zip of precompiled .pyc plus a manifest),
+which can be dropped into any of Config.CONNECTOR_PATHS.
+"""
+
+import argparse
+import sys
+import os
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from services.bundles import build_bundle, ConnectorBundle
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("name", help="Name of the bundle.")
+    parser.add_argument("version", help="Version of the bundle.")
+    parser.add_argument("sources", nargs="+", help="Connector source files (.py) to include.")
+    parser.add_argument("-o", "--out", default=".", help="Output directory.")
+    args = parser.parse_args()
+
+    out = build_bundle(args.sources, args.out, args.name, args.version)
+    bundle = ConnectorBundle(out)
+    print(f"+ wrote {out}")
+    for entry in bundle.connectors:
+        print(f"  - {entry['name']} ({entry['module']}.{entry['class']}): {len(entry['subs'])} submodules")
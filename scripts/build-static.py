@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script exports the catalogue as a static site that any web server or CDN can host.
+
+Docs are pre-rendered, and submodules whose output is plain substitution are compiled into client-side
+templates; the rest fall back to --preview-url (e.g. a running Syntac instance), if one is given.
+"""
+
+import argparse
+import sys
+import os
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+from services.loader import load_connectors
+from services.static_export import build_static
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out", help="Output directory.")
+    parser.add_argument("--preview-url", default=None, help="Server /preview endpoint used for submodules that cannot be compiled.")
+    args = parser.parse_args()
+
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    report = build_static(
+        connectors,
+        os.path.join(os.path.dirname(Config.STATIC_PATH), "templates"),
+        Config.STATIC_PATH,
+        args.out,
+        preview_url=args.preview_url,
+    )
+
+    print(f"+ exported {report['connectors']} connectors, {report['submodules']} submodules to {args.out}")
+    print(f"+ {report['compiled']} submodules render client-side")
+    for sub in report["fallback"]:
+        print(f"- {sub} needs {args.preview_url or '/preview (no --preview-url given, preview disabled)'}")
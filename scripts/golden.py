@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script renders every registered submodule over generated parameter combinations and compares the output
+against the golden snapshots in ./snapshots. Boolean parameters are covered exhaustively, other parameters
+are either left out (so the default applies) or sampled from a small value pool.
+
+    ~$ python3 scripts/golden.py            # compare, exits 1 on any difference
+    ~$ python3 scripts/golden.py --update   # accept the current output as the new snapshots
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import get_type_hints
+
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+from services.loader import load_connectors
+from services.render import global_fields, render
+
+SNAPSHOTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'snapshots'))
+
+# what a form would send for each type, the quote and space catch missing shell quoting
+VALUE_POOL = {
+    "str": ["10.0.0.1", "corp.local", "p@ss w0rd'"],
+    "int": ["0", "445"],
+    "float": ["0.5", "1"],
+}
+# string assignments sampled per boolean combination
+SAMPLES = 4
+MAX_CASES = 1024
+
+
+def _type_name(annotation) -> str:
+    return getattr(annotation, "__name__", str(annotation))
+
+
+def _params(cls, sub):
+    hints = get_type_hints(cls)
+    params = {name: _type_name(hints[name]) for name in sorted(global_fields(cls))}
+    for p in cls._submodule_sigs[sub].parameters.values():
+        params[p.name] = _type_name(p.annotation) if p.annotation is not p.empty else "str"
+    return params
+
+
+def generate_cases(name, cls, sub):
+    params = _params(cls, sub)
+    bools = [p for p, t in params.items() if t == "bool"]
+    others = [p for p, t in params.items() if t != "bool"]
+
+    # seeded from the names so the same signature always yields the same cases
+    seed = int(hashlib.sha256(f"{name}\0{sub}".encode()).hexdigest()[:16], 16)
+    rng = random.Random(seed)
+
+    cases, seen = [], set()
+    for bits in range(1 << len(bools)):
+        flags = {b: bool(bits >> i & 1) for i, b in enumerate(bools)}
+        variants = [{}, {p: VALUE_POOL.get(params[p], VALUE_POOL["str"])[0] for p in others}]
+        for _ in range(SAMPLES):
+            variants.append({
+                p: rng.choice(VALUE_POOL.get(params[p], VALUE_POOL["str"]))
+                for p in others if rng.random() < 0.6
+            })
+        for values in variants:
+            case = {**flags, **values}
+            key = json.dumps(case, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                cases.append(case)
+        if len(cases) >= MAX_CASES:
+            break
+    return cases[:MAX_CASES]
+
+
+_WORKER_CONNECTORS = None
+
+
+def _init_worker():
+    global _WORKER_CONNECTORS
+    _WORKER_CONNECTORS = load_connectors(Config.CONNECTOR_PATHS)
+
+
+def render_cases(name, sub, cases):
+    cls = _WORKER_CONNECTORS[name]
+    results = []
+    for case in cases:
+        start = time.perf_counter()
+        try:
+            output = render(cls, sub, dict(case))
+            out = {"output": output if isinstance(output, (str, int, float, bool)) or output is None else repr(output)}
+        except Exception as e:
+            out = {"error": f"{type(e).__name__}: {e}"}
+        out["ms"] = (time.perf_counter() - start) * 1000
+        results.append(out)
+    return name, sub, results
+
+
+def _snapshot_path(name):
+    return os.path.join(SNAPSHOTS, re.sub(r"[^\w.-]+", "_", name) + ".json")
+
+
+def _load_snapshot(name):
+    try:
+        with open(_snapshot_path(name)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _expected(entry):
+    return {k: v for k, v in entry.items() if k in ("output", "error")}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--update", action="store_true", help="Write the current output as the golden snapshots.")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("-k", "--filter", default="", help="Only run connectors/submodules containing this text.")
+    parser.add_argument("--slow-ms", type=float, default=5.0, help="Report cases slower than this.")
+    parser.add_argument("--timings", help="Write per-case timings as JSON to this file.")
+    args = parser.parse_args()
+
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    jobs = []
+    for name in connectors:
+        cls = connectors[name]
+        for sub in cls.sub_modules:
+            if args.filter.lower() in f"{name} {sub}".lower():
+                jobs.append((name, sub, generate_cases(name, cls, sub)))
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            rendered = list(pool.map(render_cases, *zip(*jobs))) if jobs else []
+    else:
+        _init_worker()
+        rendered = [render_cases(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    cases_by_job = {(name, sub): cases for name, sub, cases in jobs}
+    current = {}
+    for name, sub, results in rendered:
+        current.setdefault(name, {})[sub] = [
+            {"params": case, **result}
+            for case, result in zip(cases_by_job[(name, sub)], results)
+        ]
+
+    total = sum(len(c) for _, _, c in jobs)
+    slow = [
+        (name, sub, e["params"], e["ms"])
+        for name, subs in current.items() for sub, entries in subs.items()
+        for e in entries if e["ms"] > args.slow_ms
+    ]
+
+    if args.timings:
+        with open(args.timings, "w") as f:
+            json.dump([
+                {"connector": name, "sub": sub, "params": e["params"], "ms": round(e["ms"], 4)}
+                for name, subs in current.items() for sub, entries in subs.items() for e in entries
+            ], f, indent=2)
+
+    if args.update:
+        os.makedirs(SNAPSHOTS, exist_ok=True)
+        for name, subs in current.items():
+            snapshot = _load_snapshot(name) if args.filter else {}
+            for sub, entries in subs.items():
+                snapshot[sub] = [{"params": e["params"], **_expected(e)} for e in entries]
+            with open(_snapshot_path(name), "w") as f:
+                json.dump(snapshot, f, indent=2, sort_keys=True)
+                f.write("\n")
+        print(f"+ wrote snapshots for {total} cases across {len(jobs)} submodules in {elapsed:.2f}s")
+        return 0
+
+    failures = 0
+    for name, subs in current.items():
+        snapshot = _load_snapshot(name)
+        for sub, entries in subs.items():
+            golden = {json.dumps(e["params"], sort_keys=True): _expected(e) for e in snapshot.get(sub, [])}
+            seen = set()
+            for e in entries:
+                key = json.dumps(e["params"], sort_keys=True)
+                seen.add(key)
+                want, got = golden.get(key), _expected(e)
+                if want == got:
+                    continue
+                failures += 1
+                if want is None:
+                    print(f"- NEW     {name} / {sub} {key}\n    {got}")
+                    continue
+                print(f"- CHANGED {name} / {sub} {key}")
+                diff = difflib.unified_diff(
+                    json.dumps(want, indent=2).splitlines(),
+                    json.dumps(got, indent=2).splitlines(),
+                    "golden", "current", lineterm="",
+                )
+                print("\n".join(f"    {line}" for line in diff))
+            for key in golden.keys() - seen:
+                failures += 1
+                print(f"- REMOVED {name} / {sub} {key}")
+
+    for name, sub, params, ms in sorted(slow, key=lambda s: -s[3])[:20]:
+        print(f"- SLOW    {name} / {sub} {json.dumps(params, sort_keys=True)}: {ms:.2f}ms")
+
+    print(f"{'+' if not failures else '-'} {total} cases across {len(jobs)} submodules in {elapsed:.2f}s, {failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script imports nmap XML (-oX), BloodHound collections (.json or .zip) and host lists into a target
+inventory, then renders the matching connectors for every host: SMB for hosts with 445 open, Delegations
+and BloodHound for domain controllers.
+
+    ~$ python3 scripts/inventory.py scan.xml 20250101_BloodHound.zip hosts.txt -p username=alice -p password=Passw0rd!
+    ~$ python3 scripts/inventory.py scan.xml --summary
+"""
+
+import argparse
+import json
+import os
+import sys
+
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+from services.inventory import Inventory, import_file, render_inventory
+from services.loader import load_connectors
+
+
+def _pair(raw):
+    name, sep, value = raw.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {raw!r}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+", help="nmap XML, BloodHound .json/.zip or host list files.")
+    parser.add_argument("-p", "--param", type=_pair, action="append", default=[], help="name=value passed to every command, e.g. credentials.")
+    parser.add_argument("-c", "--connector", action="append", help="Only render these connectors.")
+    parser.add_argument("-s", "--sub", action="append", help="Only render these submodules.")
+    parser.add_argument("--summary", action="store_true", help="Print what was imported and stop.")
+    parser.add_argument("--ndjson", action="store_true", help="Print one JSON object per command.")
+    args = parser.parse_args()
+
+    inventory = Inventory()
+    for path in args.files:
+        count = import_file(path, inventory)
+        print(f"[+] {path}: {count} hosts", file=sys.stderr)
+
+    if args.summary:
+        print(json.dumps(inventory.summary(), indent=2))
+        return 0
+
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    if args.connector:
+        connectors = {name: connectors[name] for name in args.connector if name in connectors}
+
+    for result in render_inventory(inventory, connectors, dict(args.param), set(args.sub or ())):
+        if args.ndjson:
+            print(json.dumps(result), flush=True)
+        elif "command" in result:
+            print(f"# {result['connector']} / {result['sub']} ({result['target']})\n{result['command']}\n", flush=True)
+        else:
+            print(f"# {result['connector']} / {result['sub']} ({result['target']}): {result['error']}\n", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script replays a realistic mix of traffic against a running instance and reports latency percentiles as JSON.
+
+    ~$ python3 scripts/loadtest.py http://127.0.0.1:5000 --concurrency 32 --duration 30
+
+All clients share one address, so the per-client rate limit (Config.CLIENT_RATE) applies to the whole run;
+raise it or disable Config.ADMISSION when measuring raw throughput.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+# (connector, submodule, globals, extras that get typed into)
+FORMS = [
+    ("SMB", "List Shares (NetExec)",
+     {"host": "10.0.0.5", "username": "alice", "password": "Passw0rd!"},
+     {"is_ntlm": [False, True], "kerberos": [False, True]}),
+    ("SMB", "List Shares (SMBClient)",
+     {"host": "10.0.0.5", "username": "alice", "password": "Passw0rd!"}, {}),
+    ("BloodHound", "Collection (BloodHound.py)",
+     {"domain": "corp.local", "username": "alice", "password": "Passw0rd!", "kerberos": False},
+     {"nameserver": "10.0.0.1", "verbose": [False, True]}),
+    ("BloodHound", "Collection (RustHound-CE-Linux)",
+     {"domain": "corp.local", "username": "alice", "password": "Passw0rd!", "kerberos": False},
+     {"ldapfqdn": "dc01.corp.local", "DConly": [False, True], "ldaps": [False, True], "fqdn_resolver": [False, True]}),
+    ("Delegations", "Find Delegations (NetExec)",
+     {"dc_host": "10.0.0.1", "domain": "corp.local", "username": "alice", "password": "Passw0rd!", "is_ntlm": False}, {}),
+    ("Delegations", "Find Delegations (findDelegation.py)",
+     {"dc_host": "10.0.0.1", "domain": "corp.local", "username": "alice", "password": "Passw0rd!", "is_ntlm": True}, {}),
+]
+
+# relative weight of each scenario in the mix
+DEFAULT_MIX = {"keystrokes": 0.85, "index": 0.05, "batch": 0.1}
+
+
+def _keystroke_burst(rng: random.Random):
+    """One user typing into a field: a preview per keystroke with a growing prefix."""
+    connector, sub, globals_, extras = rng.choice(FORMS)
+    data = {"__connector": connector, "__sub": sub, **globals_}
+    for k, v in extras.items():
+        data[k] = rng.choice(v) if isinstance(v, list) else v
+
+    text_fields = [k for k, v in {**globals_, **extras}.items() if isinstance(v, str)]
+    field = rng.choice(text_fields)
+    value = str(data[field])
+    for i in range(1, len(value) + 1):
+        yield "preview", "POST", "/preview", dict(data, **{field: value[:i]})
+
+
+def _batch(rng: random.Random, size: int):
+    reqs = []
+    for _ in range(size):
+        connector, sub, globals_, extras = rng.choice(FORMS)
+        data = {"__connector": connector, "__sub": sub, **globals_}
+        for k, v in extras.items():
+            data[k] = rng.choice(v) if isinstance(v, list) else v
+        reqs.append(data)
+    yield "batch", "POST", "/batch", {"requests": reqs}
+
+
+def _index(rng: random.Random):
+    yield "index", "GET", "/", None
+
+
+def _scenario(rng: random.Random, mix, batch_size: int):
+    kind = rng.choices(list(mix), weights=list(mix.values()))[0]
+    if kind == "keystrokes":
+        return _keystroke_burst(rng)
+    if kind == "batch":
+        return _batch(rng, batch_size)
+    return _index(rng)
+
+
+def _send(base: str, method: str, path: str, body, timeout: float):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base + path, data=data, method=method)
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def _percentile(sorted_ms, p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    i = min(len(sorted_ms) - 1, max(0, int(round(p / 100 * len(sorted_ms))) - 1))
+    return sorted_ms[i]
+
+
+def summarize(samples, elapsed: float):
+    by_kind = defaultdict(list)
+    for kind, status, ms in samples:
+        by_kind[kind].append((status, ms))
+    by_kind["all"] = [(s, ms) for _, s, ms in samples]
+
+    report = {}
+    for kind, rows in by_kind.items():
+        ms = sorted(m for _, m in rows)
+        statuses = defaultdict(int)
+        for s, _ in rows:
+            statuses[str(s)] += 1
+        errors = sum(n for s, n in statuses.items() if not s.startswith("2"))
+        report[kind] = {
+            "requests": len(rows),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(_percentile(ms, 50), 2),
+            "p95_ms": round(_percentile(ms, 95), 2),
+            "p99_ms": round(_percentile(ms, 99), 2),
+            "max_ms": round(ms[-1], 2) if ms else 0.0,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "status": dict(statuses),
+        }
+    return report
+
+
+def run(base: str, concurrency: int, duration: float, mix, batch_size: int, think_ms: float, timeout: float, seed: int):
+    samples = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(n: int):
+        rng = random.Random(seed + n)
+        local = []
+        while time.monotonic() < deadline:
+            for kind, method, path, body in _scenario(rng, mix, batch_size):
+                if time.monotonic() >= deadline:
+                    break
+                start = time.perf_counter()
+                status = _send(base, method, path, body, timeout)
+                local.append((kind, status, (time.perf_counter() - start) * 1000))
+                if think_ms:
+                    time.sleep(rng.uniform(0, think_ms) / 1000)
+        with lock:
+            samples.extend(local)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    return {
+        "target": base,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": mix,
+        "results": summarize(samples, elapsed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:5000", help="Base URL of the instance.")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Number of concurrent clients.")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Duration of the run in seconds.")
+    parser.add_argument("--keystrokes", type=float, default=DEFAULT_MIX["keystrokes"], help="Weight of keystroke bursts.")
+    parser.add_argument("--index", type=float, default=DEFAULT_MIX["index"], help="Weight of index page loads.")
+    parser.add_argument("--batch", type=float, default=DEFAULT_MIX["batch"], help="Weight of batch jobs.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Previews per batch job.")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Max random pause between requests of a client.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix.")
+    parser.add_argument("-o", "--out", help="Write the JSON report to this file instead of stdout.")
+    args = parser.parse_args()
+
+    mix = {k: w for k, w in (("keystrokes", args.keystrokes), ("index", args.index), ("batch", args.batch)) if w > 0}
+    if not mix:
+        parser.error("at least one scenario needs a positive weight")
+
+    report = run(
+        args.url.rstrip("/"), args.concurrency, args.duration, mix,
+        args.batch_size, args.think_ms, args.timeout, args.seed,
+    )
+    out = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out)
+    else:
+        print(out)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script loads the connectors and reports how much memory each one retains, with a tracemalloc diff of the load.
+"""
+
+import argparse
+import sys
+import os
+import tracemalloc
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--warmup", action="store_true", help="Run the warm-up pass first, so the preview cache is populated.")
+    parser.add_argument("--budget", type=int, default=Config.MEMORY_BUDGET, help="Memory budget in bytes.")
+    parser.add_argument("--top", type=int, default=15, help="Number of allocation sites to show.")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+
+    from services.memory import memory_report, snapshot_diff, format_report
+    snapshot_diff()
+
+    from services.loader import load_connectors
+    from services.cache import init_cache
+    from services.warmup import warm_up
+
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    cache = init_cache(Config.PREVIEW_CACHE_SIZE, Config.PREVIEW_CACHE_MAX_BYTES)
+    if args.warmup:
+        warm_up(connectors, cache, workers=Config.WARMUP_WORKERS)
+
+    report = memory_report(connectors, args.budget)
+    format_report(report)
+
+    print(f"\ntop {args.top} allocation changes while loading:")
+    for stat in snapshot_diff(top=args.top):
+        print(f"  {stat['size_diff']:>+10} B {stat['count_diff']:>+6}  {stat['where']}")
+
+    if report.get("over_budget"):
+        sys.exit(1)
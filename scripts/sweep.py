@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This script renders every combination of the given parameter values for one submodule and prints each
+distinct command once, followed by the parameter sets that produce it.
+
+    ~$ python3 scripts/sweep.py SMB "List Shares (NetExec)" -s is_ntlm=true,false -s kerberos=true,false \
+           -p host=10.0.0.5 -p username=alice -p password=Passw0rd!
+
+Values are read as JSON where they parse (true, false, numbers) and as strings otherwise.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+SRC = "src"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', SRC)))
+
+from config import Config
+from services.loader import load_connectors
+from services.sweep import sweep, MAX_COMBINATIONS, MAX_DISTINCT, MAX_PARAMS_PER_COMMAND
+
+
+def _value(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _pair(raw):
+    name, sep, value = raw.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {raw!r}")
+    return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("connector", help="Connector name.")
+    parser.add_argument("sub", help="Submodule key.")
+    parser.add_argument("-s", "--sweep", type=_pair, action="append", default=[], help="name=v1,v2,... to sweep over.")
+    parser.add_argument("-p", "--param", type=_pair, action="append", default=[], help="name=value held fixed.")
+    parser.add_argument("--limit", type=int, default=MAX_COMBINATIONS, help="Max combinations to render.")
+    parser.add_argument("--max-distinct", type=int, default=MAX_DISTINCT, help="Stop after this many distinct commands.")
+    parser.add_argument("--max-params", type=int, default=MAX_PARAMS_PER_COMMAND, help="Parameter sets listed per command.")
+    parser.add_argument("--ndjson", action="store_true", help="Print the raw events, one JSON object per line.")
+    args = parser.parse_args()
+
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    cls = connectors.get(args.connector)
+    if cls is None or args.sub not in cls.sub_modules:
+        parser.error(f"unknown connector/submodule: {args.connector} / {args.sub}")
+
+    values = {name: [_value(v) for v in raw.split(",")] for name, raw in args.sweep}
+    fixed = {name: _value(v) for name, v in args.param}
+
+    events = sweep(
+        cls, args.sub, fixed, values,
+        max_combinations=args.limit, max_distinct=args.max_distinct, max_params=args.max_params,
+    )
+    for event in events:
+        if args.ndjson:
+            print(json.dumps(event), flush=True)
+        elif event["type"] == "command":
+            # printed as soon as it is first seen, the full grouping follows once the sweep ends
+            print(f"[{event['id']}] {event.get('command', 'error: ' + str(event.get('error')))}", flush=True)
+        elif event["type"] == "group":
+            print(f"\n[{event['id']}] produced by {event['count']} combination(s):")
+            for params in event["params"]:
+                print(f"    {json.dumps(params)}")
+            if event["count"] > len(event["params"]):
+                print(f"    ... {event['count'] - len(event['params'])} more")
+        else:
+            state = " (truncated)" if event["truncated"] else ""
+            print(f"\n+ {event['combinations']} combinations, {event['distinct']} distinct{state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,36 @@
+import tracemalloc
 from flask import Flask
 from rtr.init import register_routes
 from services.loader import load_connectors
+from services.cache import init_cache
+from services.warmup import warm_up, print_report
+from services.assets import load_manifest
+from services.history import init_history
+from services.admission import init_admission
+from services.profiles import init_profiles
 from config import Config
 
 
 def init():
+    if Config.MEMORY_TRACE:
+        tracemalloc.start()
+
     app = Flask(__name__)
-    load_connectors(Config.CONNECTORS_PATH)
+    connectors = load_connectors(Config.CONNECTOR_PATHS)
+    cache = init_cache(Config.PREVIEW_CACHE_SIZE, Config.PREVIEW_CACHE_MAX_BYTES)
+    if Config.WARMUP:
+        print_report(warm_up(connectors, cache, workers=Config.WARMUP_WORKERS))
+    load_manifest(Config.ASSETS_PATH)
+    init_history(Config.HISTORY_DB)
+    init_profiles(Config.MAX_PROFILES)
+    init_admission(
+        Config.ADMISSION,
+        max_inflight=Config.MAX_INFLIGHT,
+        max_queue=Config.MAX_QUEUE,
+        queue_timeout=Config.QUEUE_TIMEOUT,
+        rate=Config.CLIENT_RATE,
+        burst=Config.CLIENT_BURST,
+    )
     register_routes(app)
     return app
 
@@ -0,0 +1,200 @@
+import asyncio
+import contextvars
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app import init
+from config import Config
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+# routes that stream or fan out, served from their own pool so they cannot starve /preview
+BULK_PATHS = ("/batch", "/sweep", "/pipeline")
+# body bytes pulled from a response iterator per trip to the pool, or until this many seconds pass
+CHUNK_BYTES = 64 * 1024
+CHUNK_SECONDS = 0.01
+
+_TOO_LARGE = object()
+
+
+class AsgiAdapter:
+    """
+    Serves a WSGI app from ASGI. Waiting on the client costs no thread: the request body is read in the
+    event loop, and only calls into the app (and pulls from a streamed response) run on a bounded pool.
+    The next piece of a streamed response is only produced once the server has accepted the previous
+    one, so a slow reader slows the producer down instead of piling up output in memory.
+    """
+
+    def __init__(self, wsgi: Callable, workers: int, bulk_workers: int, max_body: int):
+        self.wsgi = wsgi
+        self.max_body = max_body
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="syntac-asgi")
+        self._bulk_pool = ThreadPoolExecutor(max_workers=bulk_workers, thread_name_prefix="syntac-asgi-bulk")
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise NotImplementedError(f"unsupported ASGI scope type {scope['type']!r}")
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._pool.shutdown(wait=False)
+                self._bulk_pool.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive: Callable) -> Any:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body += message.get("body", b"")
+            if len(body) > self.max_body:
+                return _TOO_LARGE
+            if not message.get("more_body", False):
+                return bytes(body)
+
+    async def _http(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        if body is _TOO_LARGE:
+            await send({"type": "http.response.start", "status": 413, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"request body too large"})
+            return
+
+        pool = self._bulk_pool if scope["path"].startswith(BULK_PATHS) else self._pool
+        loop = asyncio.get_running_loop()
+        environ = _environ(scope, body)
+        # flask keeps the request context of a streamed response in context variables, so every
+        # pull has to run in the same context even when it lands on a different pool thread
+        context = contextvars.copy_context()
+        started: List[Any] = []
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return lambda data: None
+
+        disconnected = asyncio.Event()
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        watcher = asyncio.ensure_future(watch())
+        iterable: Optional[Iterable[bytes]] = None
+        try:
+            iterable, iterator, chunks, done = await loop.run_in_executor(
+                pool, context.run, _start, self.wsgi, environ, start_response,
+            )
+            status, headers = started
+            await send({
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+            })
+            while True:
+                for chunk in chunks:
+                    if disconnected.is_set():
+                        return
+                    # waits for the transport to drain, which paces the next pull
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                if done or disconnected.is_set():
+                    break
+                chunks, done = await loop.run_in_executor(pool, context.run, _pull, iterator)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except OSError:
+            # the client went away mid-send
+            pass
+        finally:
+            watcher.cancel()
+            if iterable is not None and hasattr(iterable, "close"):
+                # ends the request context and releases its admission slot
+                await loop.run_in_executor(pool, context.run, iterable.close)
+
+
+def _environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    root = scope.get("root_path", "")
+    path = scope["path"]
+    if root and path.startswith(root):
+        path = path[len(root):]
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for k, v in scope.get("headers", []):
+        name = k.decode("latin-1").upper().replace("-", "_")
+        value = v.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        if name != "CONTENT_TYPE":
+            name = f"HTTP_{name}"
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+def _pull(iterator) -> Tuple[List[bytes], bool]:
+    chunks, size = [], 0
+    deadline = time.monotonic() + CHUNK_SECONDS
+    for chunk in iterator:
+        if chunk:
+            chunks.append(chunk)
+            size += len(chunk)
+        if size >= CHUNK_BYTES or time.monotonic() >= deadline:
+            return chunks, False
+    return chunks, True
+
+
+def _start(wsgi: Callable, environ: Dict[str, Any], start_response: Callable):
+    iterable = wsgi(environ, start_response)
+    iterator = iter(iterable)
+    chunks, done = _pull(iterator)
+    return iterable, iterator, chunks, done
+
+
+app = AsgiAdapter(
+    init(),
+    workers=Config.ASGI_WORKERS,
+    bulk_workers=Config.ASGI_BULK_WORKERS,
+    max_body=Config.ASGI_MAX_BODY,
+)
+
+
+if __name__ == "__main__":
+    if uvicorn is None:
+        sys.exit("uvicorn is not installed, run `pip install uvicorn` or point another ASGI server at asgi:app")
+    uvicorn.run(app, host=Config.HOST, port=Config.PORT, lifespan="on")
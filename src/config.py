@@ -4,4 +4,41 @@ class Config:
     HOST = "0.0.0.0"
     PORT = 5000
     DEBUG = True
-    CONNECTORS_PATH = os.path.join(os.path.dirname(__file__), "connectors")
\ No newline at end of file
+    CONNECTORS_PATH = os.path.join(os.path.dirname(__file__), "connectors")
+    # directories of connectors and/or connector bundles (.zip), or bundle files, in priority order
+    CONNECTOR_PATHS = [CONNECTORS_PATH]
+    STATIC_PATH = os.path.join(os.path.dirname(__file__), "static")
+    ASSETS_PATH = os.path.join(STATIC_PATH, "dist")
+    # set to a file path to record every generated command to SQLite
+    HISTORY_DB = None
+
+    # admission control for the API, see services/admission.py
+    ADMISSION = True
+    MAX_INFLIGHT = 32
+    MAX_QUEUE = 64
+    QUEUE_TIMEOUT = 0.25
+    CLIENT_RATE = 50.0
+    CLIENT_BURST = 100.0
+    # most previews one /batch (steps one /pipeline, combinations one /sweep) may ask for, larger requests get a 413
+    MAX_BATCH = 1000
+
+    # server-held global values, see services/profiles.py; least recently used are dropped past this
+    MAX_PROFILES = 1024
+
+    PREVIEW_CACHE_SIZE = 4096
+    PREVIEW_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    # render every submodule with its defaults at startup, see services/warmup.py
+    WARMUP = False
+    WARMUP_WORKERS = 4
+
+    # /debug/* is only reachable from loopback unless a token is set (sent as X-Syntac-Admin)
+    ADMIN_TOKEN = None
+    # start tracemalloc at startup so /debug/memory?snapshot=1 can diff allocations
+    MEMORY_TRACE = False
+    # in bytes, reported as over_budget by /debug/memory when exceeded
+    MEMORY_BUDGET = None
+
+    # thread pools behind src/asgi.py; bulk serves /batch, /sweep and /pipeline
+    ASGI_WORKERS = 32
+    ASGI_BULK_WORKERS = 8
+    ASGI_MAX_BODY = 16 * 1024 * 1024
@@ -1,16 +1,135 @@
 import inspect
+import re
 import markdown
 
-from abc import ABC
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import (
-    Any, Callable, ClassVar, Dict, List, OrderedDict, Type,
+    Any, Callable, ClassVar, Dict, List, Optional, OrderedDict, Sequence, Tuple, Type,
     get_type_hints,
 )
 
-def sub_module(key: str) -> Callable[[Callable], Callable]:
+
+class ConstraintError(ValueError):
+    pass
+
+
+class Constraint(ABC):
+    """
+    A rule over a submodule's parameters, checked before the submodule runs. A parameter counts as
+    set when its value is truthy, the same test the submodule bodies use. app.js evaluates the
+    exported form of every constraint, so keep check() and to_dict() in sync with it.
+    """
+    kind = ""
+
+    def __init__(self, *params: str, message: Optional[str] = None):
+        self.params = params
+        self.message = message
+
+    @abstractmethod
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        """The message to show if values break the rule, None if they don't."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.kind, "params": list(self.params), "message": self.message}
+
+
+class Exclusive(Constraint):
+    """At most one of params may be set."""
+    kind = "exclusive"
+
+    def __init__(self, *params: str, message: Optional[str] = None):
+        super().__init__(*params, message=message or f"Use only one of {', '.join(params)}")
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        return self.message if sum(bool(values.get(p)) for p in self.params) > 1 else None
+
+
+class OneOf(Constraint):
+    """Exactly one of params must be set."""
+    kind = "one_of"
+
+    def __init__(self, *params: str, message: Optional[str] = None):
+        super().__init__(*params, message=message or f"Set exactly one of {', '.join(params)}")
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        return self.message if sum(bool(values.get(p)) for p in self.params) != 1 else None
+
+
+class Requires(Constraint):
+    """If param is set, every one of needs must be set too."""
+    kind = "requires"
+
+    def __init__(self, param: str, *needs: str, message: Optional[str] = None):
+        super().__init__(param, *needs, message=message or f"{param} requires {', '.join(needs)}")
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        param, *needs = self.params
+        if values.get(param) and not all(values.get(n) for n in needs):
+            return self.message
+        return None
+
+
+# plain decimal numbers only, no whitespace, underscores, hex or inf; app.js uses the same pattern
+# so both sides agree on what counts as a number before converting it
+_NUMBER = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+class Range(Constraint):
+    """If param is set, it must be a decimal number within [minimum, maximum]."""
+    kind = "range"
+
+    def __init__(
+        self,
+        param: str,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        message: Optional[str] = None,
+    ):
+        lo = "" if minimum is None else f"{minimum} <= "
+        hi = "" if maximum is None else f" <= {maximum}"
+        super().__init__(param, message=message or f"{param} must be a number, {lo}{param}{hi}")
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        value = values.get(self.params[0])
+        if value in (None, "") or isinstance(value, bool):
+            return None
+        if not _NUMBER.fullmatch(str(value)):
+            return self.message
+        n = float(value)
+        if (self.minimum is not None and n < self.minimum) or (self.maximum is not None and n > self.maximum):
+            return self.message
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "min": self.minimum, "max": self.maximum}
+
+
+class Pattern(Constraint):
+    """If param is set, it must fully match pattern. Stick to syntax that means the same in JavaScript."""
+    kind = "pattern"
+
+    def __init__(self, param: str, pattern: str, message: Optional[str] = None):
+        super().__init__(param, message=message or f"{param} must match {pattern}")
+        self.pattern = pattern
+        self._regex = re.compile(pattern)
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        value = values.get(self.params[0])
+        if value in (None, "") or isinstance(value, bool):
+            return None
+        return None if self._regex.fullmatch(str(value)) else self.message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "pattern": self.pattern}
+
+
+def sub_module(key: str, constraints: Sequence[Constraint] = ()) -> Callable[[Callable], Callable]:
     def decorator(fn: Callable) -> Callable:
         setattr(fn, "_sub_module_key", key)
+        setattr(fn, "_sub_module_constraints", tuple(constraints))
         return fn
     return decorator
 
@@ -21,11 +140,13 @@ class Module(ABC):
 
     sub_modules:         ClassVar[Dict[str, Callable]]     = {}
     _submodule_sigs:     ClassVar[Dict[str, inspect.Signature]] = {}
+    _submodule_constraints: ClassVar[Dict[str, Tuple[Constraint, ...]]] = {}
 
     def __init_subclass__(cls, **kwargs: Any):
         super().__init_subclass__(**kwargs)
         mods: Dict[str, Callable] = {}
         sigs: Dict[str, inspect.Signature] = {}
+        constraints: Dict[str, Tuple[Constraint, ...]] = {}
         for attr, val in cls.__dict__.items():
             if callable(val) and hasattr(val, "_sub_module_key"):
                 key = getattr(val, "_sub_module_key")
@@ -33,8 +154,10 @@ class Module(ABC):
                 sig = inspect.signature(val)
                 params = list(sig.parameters.values())[1:]
                 sigs[key] = inspect.Signature(params)
+                constraints[key] = getattr(val, "_sub_module_constraints", ())
         cls.sub_modules = mods
         cls._submodule_sigs = sigs
+        cls._submodule_constraints = constraints
 
     def __init__(self, **kwargs: Any):
         cls = type(self)
@@ -78,7 +201,7 @@ class Module(ABC):
         params = OrderedDict(sig.parameters)
         return params
 
-    def run_sub_module(self, key: str, **kwargs: Any) -> Any:
+    def bind_sub_module(self, key: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         if key not in self.sub_modules:
             raise KeyError(f"{self.name} has no sub_module {key}")
 
@@ -94,6 +217,26 @@ class Module(ABC):
                 raise TypeError(
                     f"{key} missing required argument '{name}'"
                 )
+        return call_args
+
+    def check_constraints(self, key: str, call_args: Dict[str, Any]) -> None:
+        constraints = self._submodule_constraints.get(key, ())
+        if not constraints:
+            return
+
+        values = self.get_params()
+        for name, param in self._submodule_sigs[key].parameters.items():
+            if param.default is not inspect._empty:
+                values[name] = param.default
+        values.update(call_args)
+
+        errors = [e for e in (c.check(values) for c in constraints) if e]
+        if errors:
+            raise ConstraintError("; ".join(errors))
+
+    def run_sub_module(self, key: str, **kwargs: Any) -> Any:
+        call_args = self.bind_sub_module(key, kwargs)
+        self.check_constraints(key, call_args)
 
         method = self.sub_modules[key]
         return method(self, **call_args)
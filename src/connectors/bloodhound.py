@@ -1,4 +1,4 @@
-from .base import Module, register_module, sub_module
+from .base import Exclusive, Module, Range, register_module, sub_module
 
 
 @register_module
@@ -47,7 +47,10 @@ class BloodHound(Module):
     ) -> str:
         return f"SharpHound.exe --CollectionMethods All --ZipFileName {output}.zip"
 
-    @sub_module("Collection (RustHound-CE-Linux)")
+    @sub_module("Collection (RustHound-CE-Linux)", constraints=[
+        Exclusive("ldapip", "ldaps", message="Cannot use both ldapip (-i) and ldaps (--ldaps) options at the same time. Clear ldapip field or uncheck ldaps!"),
+        Range("custom_port", 1, 65535),
+    ])
     def run_rusthoundce_linux(
         self,
         ldapfqdn: str = "",
@@ -62,9 +65,6 @@ class BloodHound(Module):
         """
         Collects BloodHound-CE using [RustHoundCE](https://github.com/g0h4n/RustHound-CE) from Linux
         """
-        if ldaps and ldapip:
-           return ("Cannot use both ldapip (-i) and ldaps (--ldaps) options at the same time. Clear ldapip field or uncheck ldaps!")
-
         if self.kerberos:
             return f"rusthound-ce -d '{self.domain}' -f {ldapfqdn} -k -o {path} -z"
 
@@ -103,4 +103,4 @@ class BloodHound(Module):
         if gssapi_session:
             return f"rusthound-ce.exe -d {self.domain} --ldapfqdn {ldapfqdn}"
         else:
-            return f"rusthound-ce.exe -d {self.domain} -u {self.username}l -p {self.password} -o output -z"
\ No newline at end of file
+            return f"rusthound-ce.exe -d {self.domain} -u {self.username} -p {self.password} -o output -z"
\ No newline at end of file
@@ -66,14 +66,14 @@ class Demo(Module):
         Rotates the characters in a string by 13 positions in the alphabet.
         """
         def _rot13(s: str) -> str:
-            s = ""
-            for c in text:
+            out = []
+            for c in s:
                 if 'a' <= c <= 'z':
-                    s += chr((ord(c) - ord('a') + 13) % 26 + ord('a'))
+                    out.append(chr((ord(c) - ord('a') + 13) % 26 + ord('a')))
                 elif 'A' <= c <= 'Z':
-                    s += chr((ord(c) - ord('A') + 13) % 26 + ord('A'))
+                    out.append(chr((ord(c) - ord('A') + 13) % 26 + ord('A')))
                 else:
-                    s += c
-            return s
+                    out.append(c)
+            return "".join(out)
         
         return _rot13(text)            
\ No newline at end of file
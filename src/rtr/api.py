@@ -1,48 +1,263 @@
-from flask import Blueprint, request, jsonify
-from typing import get_type_hints, ClassVar
+import math
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
+from config import Config
+from connectors.base import ConstraintError
 from services.loader import get_connectors
+from services.history import get_history
+from services.profiles import get_profiles
+from services.render import render
+from services.cache import get_cache, MISS
+from services.pipeline import Pipeline
+from services.sweep import sweep as run_sweep, MAX_COMBINATIONS
+from services.admission import get_admission, Rejected, BATCH, INTERACTIVE
+from services.wire import (
+    JSON, MSGPACK, NDJSON, WireError,
+    decode, encode, negotiate, ndjson_lines, resolve_ids, schema_ids,
+)
 
 api_bp = Blueprint('api', __name__)
 
+_BATCH_ENDPOINTS = {"api.batch", "api.pipeline", "api.sweep"}
+
+
+@api_bp.before_request
+def admit():
+    controller = get_admission()
+    if controller is None:
+        return None
+
+    priority = BATCH if (
+        request.endpoint in _BATCH_ENDPOINTS
+        or request.headers.get("X-Syntac-Priority") == BATCH
+    ) else INTERACTIVE
+
+    try:
+        controller.acquire(request.remote_addr or "", priority)
+    except Rejected as e:
+        resp = jsonify(error=e.reason)
+        resp.status_code = e.status
+        resp.headers["Retry-After"] = str(e.retry_after)
+        return resp
+    g.admitted = priority
+
+
+@api_bp.teardown_request
+def release(exc=None):
+    priority = g.pop("admitted", None)
+    if priority is not None:
+        get_admission().release(priority)
+
 
 @api_bp.route("/preview", methods=["POST"])
 def preview():
-    data = request.json or {}
+    data = _read_body()
+    if not isinstance(data, dict):
+        return _respond(dict(error="expected an object"), 400)
+    body, status = _preview(data)
+    return _respond(body, status)
+
+
+@api_bp.route("/batch", methods=["POST"])
+def batch():
+    data = _read_body()
+    items = data if isinstance(data, list) else (data or {}).get("requests", [])
+    if not isinstance(items, list) or not all(isinstance(r, dict) for r in items):
+        return _respond(dict(error="requests must be a list of objects"), 400)
+    # the whole batch is admitted once, so its size is what keeps it within the client's rate
+    if len(items) > Config.MAX_BATCH:
+        return _respond(dict(error=f"at most {Config.MAX_BATCH} requests per batch"), 413)
+
+    results = (_preview(dict(r))[0] for r in items)
+    if negotiate(request.headers.get("Accept"), (JSON, MSGPACK, NDJSON)) == NDJSON:
+        return Response(stream_with_context(ndjson_lines(results)), mimetype=NDJSON)
+    return _respond(dict(results=list(results)))
+
+
+@api_bp.route("/sweep", methods=["POST"])
+def sweep():
+    data = _read_body()
+    if not isinstance(data, dict):
+        return _respond(dict(error="expected an object"), 400)
+
+    values = data.pop("__sweep", None)
+    limit = data.pop("__limit", MAX_COMBINATIONS)
+    if not isinstance(values, dict) or not all(isinstance(v, list) for v in values.values()):
+        return _respond(dict(error="__sweep must map parameters to lists of values"), 400)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        return _respond(dict(error="__limit must be a positive integer"), 400)
+    # admitted once like /batch, so the combinations it will render are capped the same way
+    combinations = min(math.prod(len(v) for v in values.values()), limit)
+    if combinations > Config.MAX_BATCH:
+        return _respond(dict(
+            error=f"at most {Config.MAX_BATCH} combinations per sweep, narrow __sweep or set __limit",
+        ), 413)
+
+    name, sub = data.pop("__connector", None), data.pop("__sub", None)
+    if not _is_id(name) or not _is_id(sub):
+        return _respond(dict(error="__connector and __sub must be a name or a numeric id"), 400)
+
+    connectors = get_connectors()
+    name, sub = resolve_ids(connectors, name, sub)
+    cls = connectors.get(name) if name not in (None, "") else None
+    if not cls or sub not in cls.sub_modules:
+        return _respond(dict(error="unknown"), 404)
+
+    events = run_sweep(cls, sub, data, values, max_combinations=min(limit, MAX_COMBINATIONS))
+    # streamed unless the client explicitly asks for a single document
+    if negotiate(request.headers.get("Accept"), (JSON, MSGPACK, NDJSON), default=NDJSON) == NDJSON:
+        return Response(stream_with_context(ndjson_lines(events)), mimetype=NDJSON)
+    return _respond(dict(events=list(events)))
+
+
+@api_bp.route("/schema", methods=["GET"])
+def schema():
+    return _respond(dict(connectors=schema_ids(get_connectors())))
+
+
+@api_bp.errorhandler(WireError)
+def malformed_body(e):
+    # answered in the negotiated format, msgpack and ndjson clients can't read an html error page
+    return _respond(dict(error=str(e)), 400)
+
+
+def _read_body():
+    return decode(request.get_data(), request.content_type)
+
+
+def _is_id(value):
+    """A name or a numeric id, anything else can't be looked up in the catalogue."""
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+
+def _respond(body, status=200):
+    mt = negotiate(request.headers.get("Accept"), (JSON, MSGPACK))
+    return Response(encode(body, mt), status=status, mimetype=mt)
+
+
+def _preview(data):
     name = data.pop("__connector", None)
     sub = data.pop("__sub", None)
+    profile_id = data.pop("__profile", None)
     
-    if not name or not sub:
-        return jsonify(error="connector/sub missing"), 400
+    if name in (None, "") or sub in (None, ""):
+        return dict(error="connector/sub missing"), 400
+    if not _is_id(name) or not _is_id(sub):
+        return dict(error="connector/sub must be a name or a numeric id"), 400
     
     connectors = get_connectors()
-    cls = connectors.get(name)
+    name, sub = resolve_ids(connectors, name, sub)
+    cls = connectors.get(name) if name is not None else None
     
     if not cls or sub not in cls.sub_modules:
-        return jsonify(error="unknown"), 404
+        return dict(error="unknown"), 404
+
+    profile = None
+    if profile_id is not None:
+        store = get_profiles()
+        profile = store.get(profile_id) if store is not None and isinstance(profile_id, str) else None
+        if profile is None:
+            return dict(error="unknown profile"), 404
+        # globals the client changed ride along with the preview instead of a separate PATCH
+        data = profile.apply(cls, data)
 
     try:
-        cmd = _generate_command(cls, data, sub)
-        return jsonify(command=cmd)
+        cmd, params = _generate_command(cls, data, sub, profile)
+        history = get_history()
+        if history is not None:
+            history.record(name, sub, params, cmd, cls)
+        return dict(command=cmd), 200
+    except ConstraintError as e:
+        return dict(error=str(e)), 400
     except Exception as e:
-        return jsonify(error=str(e)), 500
+        return dict(error=str(e)), 500
 
 
-def _generate_command(cls, data, sub):
-    hints = get_type_hints(cls, include_extras=True)
-    
-    global_kwargs = {
-        k: data[k]
-        for k in hints
-        if k in data
-        and not getattr(
-            hints[k].__origin__ if hasattr(hints[k], "__origin__") else None,
-            "__origin__",
-            None,
-        )
-        is ClassVar
-    }
-    
-    inst = cls(**global_kwargs)
-    extras = {k: data[k] for k in data if k not in global_kwargs}
-    
-    return inst.run_sub_module(sub, **extras)
\ No newline at end of file
+@api_bp.route("/pipeline", methods=["POST"])
+def pipeline():
+    try:
+        pipe = Pipeline.from_dict(_read_body() or {})
+    except ValueError as e:
+        return _respond(dict(error=str(e)), 400)
+    if len(pipe.steps) > Config.MAX_BATCH:
+        return _respond(dict(error=f"at most {Config.MAX_BATCH} steps per pipeline"), 413)
+
+    connectors = get_connectors()
+    steps = pipe.render(connectors)
+    history = get_history()
+    if history is not None:
+        for step in steps:
+            if "command" in step:
+                cls = connectors[step["connector"]]
+                history.record(step["connector"], step["sub"], step["params"], step["command"], cls)
+    return _respond(dict(steps=steps))
+
+
+@api_bp.route("/profiles", methods=["POST"])
+def create_profile():
+    store = get_profiles()
+    if store is None:
+        return _respond(dict(error="profiles are disabled"), 404)
+    values = _read_body() or {}
+    if not isinstance(values, dict):
+        return _respond(dict(error="expected an object of global values"), 400)
+    return _respond(store.create(values).masked(), 201)
+
+
+@api_bp.route("/profiles/<profile_id>", methods=["GET", "PATCH", "DELETE"])
+def profile_detail(profile_id):
+    store = get_profiles()
+    found = store.get(profile_id) if store is not None else None
+    if found is None:
+        return _respond(dict(error="unknown profile"), 404)
+
+    if request.method == "DELETE":
+        store.delete(profile_id)
+        return _respond(dict(deleted=profile_id))
+    if request.method == "PATCH":
+        changes = _read_body() or {}
+        if not isinstance(changes, dict):
+            return _respond(dict(error="expected an object of global values"), 400)
+        found.update(changes)
+    return _respond(found.masked())
+
+
+@api_bp.route("/history", methods=["GET"])
+def history():
+    store = get_history()
+    if store is None:
+        return jsonify(error="history is disabled"), 404
+
+    rows = store.query(
+        target=request.args.get("host"),
+        connector=request.args.get("connector"),
+        submodule=request.args.get("sub"),
+        limit=request.args.get("limit", 100, type=int),
+    )
+    return jsonify(commands=rows)
+
+
+def _generate_command(cls, data, sub, profile=None):
+    """Returns the command and the effective parameters it was rendered from."""
+    inst = None
+    params = data
+    if profile is not None:
+        # one snapshot for the cache key, the render and the history record, so a concurrent change
+        # to the profile can't pair one version's globals with another's output
+        global_kwargs, inst = profile.snapshot(cls)
+        params = {**global_kwargs, **data}
+
+    cache = get_cache()
+    if cache is None:
+        return _render(cls, sub, data, inst), params
+
+    # keyed on the effective parameters, so profile and plain requests share entries
+    key = cache.key(cls.name, sub, params)
+    cmd = cache.get(key)
+    if cmd is MISS:
+        cmd = _render(cls, sub, data, inst)
+        cache.put(key, cmd)
+    return cmd, params
+
+
+def _render(cls, sub, data, inst=None):
+    return render(cls, sub, data) if inst is None else inst.run_sub_module(sub, **data)
@@ -0,0 +1,40 @@
+import mimetypes
+import os
+from flask import Blueprint, request, send_file, url_for, abort
+from werkzeug.security import safe_join
+from services.assets import ENCODINGS, get_manifest, pick_encoding
+from config import Config
+
+assets_bp = Blueprint('assets', __name__)
+
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@assets_bp.app_context_processor
+def inject_asset_url():
+    def asset_url(filename):
+        hashed = get_manifest().get(filename)
+        if hashed:
+            return url_for('assets.asset', filename=hashed)
+        return url_for('static', filename=filename)
+    return dict(asset_url=asset_url)
+
+
+@assets_bp.route("/assets/<path:filename>")
+def asset(filename):
+    full = safe_join(Config.ASSETS_PATH, filename)
+    if full is None or not os.path.isfile(full):
+        abort(404)
+
+    encoding = pick_encoding(full, request.headers.get("Accept-Encoding", ""))
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if encoding:
+        resp = send_file(full + dict(ENCODINGS)[encoding], mimetype=mimetype)
+        resp.headers["Content-Encoding"] = encoding
+    else:
+        resp = send_file(full, mimetype=mimetype)
+
+    resp.headers["Cache-Control"] = _IMMUTABLE
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
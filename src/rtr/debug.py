@@ -0,0 +1,27 @@
+import hmac
+from flask import Blueprint, request, jsonify, abort
+from services.loader import get_connectors
+from services.memory import memory_report, snapshot_diff
+from config import Config
+
+debug_bp = Blueprint('debug', __name__, url_prefix='/debug')
+
+_LOOPBACK = {"127.0.0.1", "::1"}
+
+
+@debug_bp.before_request
+def require_admin():
+    token = request.headers.get("X-Syntac-Admin", "")
+    if Config.ADMIN_TOKEN:
+        if not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+            abort(403)
+    elif request.remote_addr not in _LOOPBACK:
+        abort(403)
+
+
+@debug_bp.route("/memory", methods=["GET"])
+def memory():
+    report = memory_report(get_connectors(), Config.MEMORY_BUDGET)
+    if request.args.get("snapshot"):
+        report["diff"] = snapshot_diff(top=request.args.get("top", 20, type=int))
+    return jsonify(report)
@@ -1,7 +1,11 @@
 from .index import index_bp
 from .api import api_bp
+from .assets import assets_bp
+from .debug import debug_bp
 
 
 def register_routes(app):
     app.register_blueprint(index_bp)
-    app.register_blueprint(api_bp)
\ No newline at end of file
+    app.register_blueprint(api_bp)
+    app.register_blueprint(assets_bp)
+    app.register_blueprint(debug_bp)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_CONTROLLER = None
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def take(self) -> float:
+        """Takes a token, returns 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_inflight: int = 32,
+        max_queue: int = 64,
+        queue_timeout: float = 0.25,
+        rate: float = 50.0,
+        burst: float = 100.0,
+        batch_inflight: Optional[int] = None,
+        max_clients: int = 10000,
+    ):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst
+        # batch traffic never takes the last slots, so interactive users always get in
+        self.batch_inflight = batch_inflight if batch_inflight is not None else max(1, max_inflight // 2)
+        self.max_clients = max_clients
+
+        self.inflight = {INTERACTIVE: 0, BATCH: 0}
+        self.waiting = {INTERACTIVE: 0, BATCH: 0}
+        self._cond = threading.Condition()
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def _rate_limit(self, client: str, priority: str) -> None:
+        key = (client, priority)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._buckets.clear()
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        wait = bucket.take()
+        if wait:
+            raise Rejected(429, "rate limit exceeded", wait)
+
+    def _can_run(self, priority: str) -> bool:
+        total = self.inflight[INTERACTIVE] + self.inflight[BATCH]
+        if total >= self.max_inflight:
+            return False
+        if priority == BATCH:
+            return self.waiting[INTERACTIVE] == 0 and self.inflight[BATCH] < self.batch_inflight
+        return True
+
+    def acquire(self, client: str, priority: str = INTERACTIVE) -> None:
+        with self._cond:
+            self._rate_limit(client, priority)
+
+            if self._can_run(priority):
+                self.inflight[priority] += 1
+                return
+
+            if self.waiting[INTERACTIVE] + self.waiting[BATCH] >= self.max_queue:
+                raise Rejected(503, "server is saturated", self.queue_timeout)
+
+            self.waiting[priority] += 1
+            try:
+                admitted = self._cond.wait_for(lambda: self._can_run(priority), timeout=self.queue_timeout)
+            finally:
+                self.waiting[priority] -= 1
+
+            if not admitted:
+                # batch waiters may have been held back by us, let them re-check
+                self._cond.notify_all()
+                raise Rejected(503, "server is saturated", self.queue_timeout)
+            self.inflight[priority] += 1
+
+    def release(self, priority: str = INTERACTIVE) -> None:
+        with self._cond:
+            self.inflight[priority] -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return {"inflight": dict(self.inflight), "waiting": dict(self.waiting)}
+
+
+def init_admission(enabled: bool, **kwargs) -> Optional[AdmissionController]:
+    global _CONTROLLER
+    _CONTROLLER = AdmissionController(**kwargs) if enabled else None
+    return _CONTROLLER
+
+
+def get_admission() -> Optional[AdmissionController]:
+    return _CONTROLLER
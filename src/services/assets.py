@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS = ["js/app.js", "js/interact.min.js", "css/style.css"]
+MANIFEST = "manifest.json"
+
+# ordered by preference, the first encoding the client accepts wins
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+_MANIFEST = None
+
+
+def _fingerprint(path: str, digest: str) -> str:
+    base, ext = os.path.splitext(path)
+    if base.endswith(".min"):
+        base, ext = base[:-4], ".min" + ext
+    return f"{base}.{digest}{ext}"
+
+
+def build_assets(static_path: str, dist_path: str) -> Dict[str, str]:
+    manifest: Dict[str, str] = {}
+    for asset in ASSETS:
+        with open(os.path.join(static_path, asset), "rb") as f:
+            raw = f.read()
+
+        hashed = _fingerprint(asset, hashlib.sha256(raw).hexdigest()[:12])
+        out = os.path.join(dist_path, hashed)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+
+        with open(out, "wb") as f:
+            f.write(raw)
+        with open(out + ".gz", "wb") as f:
+            f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(out + ".br", "wb") as f:
+                f.write(brotli.compress(raw, quality=11))
+
+        manifest[asset] = hashed
+
+    with open(os.path.join(dist_path, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(dist_path: str) -> Dict[str, str]:
+    global _MANIFEST
+    try:
+        with open(os.path.join(dist_path, MANIFEST)) as f:
+            _MANIFEST = json.load(f)
+    except FileNotFoundError:
+        _MANIFEST = {}
+    return _MANIFEST
+
+
+def get_manifest() -> Dict[str, str]:
+    return _MANIFEST or {}
+
+
+def pick_encoding(full_path: str, accept_encoding: str) -> Optional[str]:
+    """
+    The highest-q encoding the client accepts that has a precompressed file, br before gzip on a tie.
+    Parsed like wire.negotiate; q=0 (in any spelling) rules an encoding out, as does "*;q=0" for
+    any encoding not listed by name.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        fields = part.split(";")
+        name = fields[0].strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for f in fields[1:]:
+            k, _, v = f.strip().partition("=")
+            if k.strip().lower() == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding, suffix in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q and os.path.isfile(full_path + suffix):
+            best, best_q = encoding, q
+    return best
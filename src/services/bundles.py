@@ -0,0 +1,162 @@
+import importlib.util
+import json
+import os
+import py_compile
+import re
+import sys
+import tempfile
+import threading
+import zipfile
+import zipimport
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+from connectors.base import Module, get_registered_modules
+from services.parser import build_connector_description
+
+MANIFEST = "manifest.json"
+# bundle modules are imported as children of the connectors package so `from .base import ...` keeps working
+PACKAGE = "connectors"
+
+
+class ConnectorCatalogue(Mapping):
+    """Connector classes by name, where bundled connectors are only imported on first access."""
+
+    def __init__(self):
+        self._loaded: Dict[str, Type[Module]] = {}
+        self._lazy: Dict[str, Callable[[], Type[Module]]] = {}
+        self._descriptions: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, cls: Type[Module]) -> None:
+        if name not in self:
+            self._order.append(name)
+            self._loaded[name] = cls
+
+    def add_lazy(
+        self, name: str, loader: Callable[[], Type[Module]], description: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if name not in self:
+            self._order.append(name)
+            self._lazy[name] = loader
+            if description is not None:
+                self._descriptions[name] = description
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def description(self, name: str) -> Optional[Dict[str, Any]]:
+        """The description stored in the bundle manifest, for describing a connector without importing it."""
+        return self._descriptions.get(name)
+
+    def __getitem__(self, name: str) -> Type[Module]:
+        cls = self._loaded.get(name)
+        if cls is not None:
+            return cls
+        loader = self._lazy[name]
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = loader()
+            return self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaded or name in self._lazy
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._order))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class ConnectorBundle:
+    def __init__(self, path: str):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            self.manifest: Dict[str, Any] = json.loads(zf.read(MANIFEST))
+
+        self.name = self.manifest["name"]
+        self.version = self.manifest.get("version", "0")
+        tag = self.manifest.get("python")
+        if tag != sys.implementation.cache_tag:
+            raise ImportError(
+                f"bundle {self.name} {self.version} was compiled for {tag}, "
+                f"this interpreter is {sys.implementation.cache_tag}"
+            )
+        self._importer = zipimport.zipimporter(path)
+
+    @property
+    def connectors(self) -> List[Dict[str, Any]]:
+        return self.manifest.get("connectors", [])
+
+    def _module_name(self, module: str) -> str:
+        safe = re.sub(r"\W", "_", self.name)
+        return f"{PACKAGE}.{safe}__{module}"
+
+    def _import(self, module: str) -> None:
+        fullname = self._module_name(module)
+        if fullname in sys.modules:
+            return
+        spec = importlib.util.spec_from_loader(fullname, loader=None, origin=f"{self.path}/{module}.pyc")
+        mod = importlib.util.module_from_spec(spec)
+        mod.__file__ = spec.origin
+        sys.modules[fullname] = mod
+        try:
+            exec(self._importer.get_code(module), mod.__dict__)
+        except BaseException:
+            del sys.modules[fullname]
+            raise
+
+    def loader(self, entry: Dict[str, Any]) -> Callable[[], Type[Module]]:
+        def load() -> Type[Module]:
+            self._import(entry["module"])
+            cls = get_registered_modules().get(entry["name"])
+            if cls is None:
+                raise ImportError(f"bundle {self.name} did not register connector {entry['name']}")
+            return cls
+        return load
+
+
+def build_bundle(sources: List[str], out_dir: str, name: str, version: str) -> str:
+    entries: List[Dict[str, Any]] = []
+    compiled: Dict[str, bytes] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for src in sources:
+            module = os.path.splitext(os.path.basename(src))[0]
+            spec = importlib.util.spec_from_file_location(f"{PACKAGE}._build__{module}", src)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+
+            for cname, cls in get_registered_modules().items():
+                if cls.__module__ == mod.__name__:
+                    entries.append({
+                        "name": cname,
+                        "module": module,
+                        "class": cls.__name__,
+                        "subs": list(cls.sub_modules),
+                        # globals, extras, docs and constraints, so listing the catalogue needs no import
+                        "description": build_connector_description({cname: cls})[cname],
+                    })
+
+            cfile = os.path.join(tmp, module + ".pyc")
+            py_compile.compile(
+                src, cfile, doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            with open(cfile, "rb") as f:
+                compiled[module] = f.read()
+
+    manifest = {
+        "name": name,
+        "version": version,
+        "python": sys.implementation.cache_tag,
+        "connectors": entries,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    out = os.path.join(out_dir, f"{name}-{version}.zip")
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(MANIFEST, json.dumps(manifest, indent=2))
+        for module, data in compiled.items():
+            zf.writestr(module + ".pyc", data)
+    return out
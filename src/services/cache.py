@@ -0,0 +1,72 @@
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+MISS = object()
+_CACHE = None
+
+
+def _entry_size(key: Tuple[str, str, str], value: Any) -> int:
+    return sum(sys.getsizeof(k) for k in key) + sys.getsizeof(value)
+
+
+class PreviewCache:
+    def __init__(self, max_size: int = 4096, max_bytes: Optional[int] = None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str, sub: str, data: Dict[str, Any]) -> Tuple[str, str, str]:
+        return (name, sub, json.dumps(data, sort_keys=True, default=str))
+
+    def get(self, key: Tuple[str, str, str]) -> Any:
+        with self._lock:
+            value = self._entries.get(key, MISS)
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[str, str, str], value: Any) -> None:
+        with self._lock:
+            old = self._entries.pop(key, MISS)
+            if old is not MISS:
+                self.nbytes -= _entry_size(key, old)
+            self._entries[key] = value
+            self.nbytes += _entry_size(key, value)
+            while self._entries and (
+                len(self._entries) > self.max_size
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            ):
+                k, v = self._entries.popitem(last=False)
+                self.nbytes -= _entry_size(k, v)
+
+    def usage_by_connector(self) -> Dict[str, Tuple[int, int]]:
+        usage: Dict[str, Tuple[int, int]] = {}
+        with self._lock:
+            for key, value in self._entries.items():
+                count, nbytes = usage.get(key[0], (0, 0))
+                usage[key[0]] = (count + 1, nbytes + _entry_size(key, value))
+        return usage
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def init_cache(max_size: int, max_bytes: Optional[int] = None) -> Optional[PreviewCache]:
+    global _CACHE
+    _CACHE = PreviewCache(max_size, max_bytes) if max_size > 0 else None
+    return _CACHE
+
+
+def get_cache() -> Optional[PreviewCache]:
+    return _CACHE
@@ -0,0 +1,206 @@
+import hashlib
+import hmac
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type
+from connectors.base import Module
+from services.render import render
+
+# parameters whose values are never written to disk in the clear
+SECRET_FIELDS = {"password", "hash", "hashes", "aeskey", "token", "secret", "key"}
+MASK = "***"
+# parameters whose values identify what a command was run against
+TARGET_FIELDS = {"host", "dc_host", "domain", "ldapip", "ldapfqdn", "nameserver"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    id        INTEGER PRIMARY KEY,
+    ts        REAL NOT NULL,
+    connector TEXT NOT NULL,
+    submodule TEXT NOT NULL,
+    params    TEXT NOT NULL,
+    command   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS targets (
+    command_id INTEGER NOT NULL REFERENCES commands(id),
+    target     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_commands_sub ON commands(connector, submodule, ts);
+CREATE INDEX IF NOT EXISTS idx_targets_target ON targets(target, command_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+_STORE = None
+
+
+def _secrets(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in params.items() if k.lower() in SECRET_FIELDS and v not in ("", None, False)}
+
+
+def _masked_command(cls: Optional[Type[Module]], submodule: str, params: Dict[str, Any], command: str) -> str:
+    secrets = _secrets(params)
+    if not secrets:
+        return command
+    if cls is not None:
+        # rendered again with placeholders, so only the secret arguments themselves are masked
+        try:
+            return str(render(cls, submodule, {**params, **{k: MASK for k in secrets}}, check=False))
+        except Exception:
+            pass
+    # without the class, only mask whole tokens, never a substring of a host or a flag
+    for v in secrets.values():
+        command = re.sub(rf"(?<![\w.-]){re.escape(str(v))}(?![\w.-])", MASK, command)
+    return command
+
+
+class HistoryStore:
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.5, max_pending: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        # rows the writer could not store, e.g. values sqlite cannot encode
+        self.failed = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        # per-database key, so stored secret digests cannot be looked up in a precomputed dictionary
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('secret_key', ?)", (os.urandom(32),))
+        conn.commit()
+        self._key = conn.execute("SELECT value FROM meta WHERE key = 'secret_key'").fetchone()[0]
+
+        self._writer = threading.Thread(target=self._run, name="syntac-history", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self, connector: str, submodule: str, params: Dict[str, Any], command: Any,
+        cls: Optional[Type[Module]] = None,
+    ) -> None:
+        """params should be the effective parameters; cls lets the writer re-render the command with secrets masked."""
+        try:
+            self._queue.put_nowait((time.time(), connector, submodule, dict(params), str(command), cls))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(conn, batch)
+            except Exception:
+                # the batch was rolled back, retry row by row so one bad row only loses itself
+                for row in batch:
+                    try:
+                        self._write(conn, [row])
+                    except Exception as e:
+                        self.failed += 1
+                        print(f"- history: could not record {row[1]} / {row[2]}: {type(e).__name__}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        with conn:
+            for ts, connector, submodule, params, command, cls in batch:
+                command = _masked_command(cls, submodule, params, command)
+                params = self._redact(params)
+                cur = conn.execute(
+                    "INSERT INTO commands (ts, connector, submodule, params, command) VALUES (?, ?, ?, ?, ?)",
+                    (ts, connector, submodule, json.dumps(params, default=str), command),
+                )
+                targets = {
+                    str(v) for k, v in params.items()
+                    if k.lower() in TARGET_FIELDS and v not in ("", None)
+                }
+                conn.executemany(
+                    "INSERT INTO targets (command_id, target) VALUES (?, ?)",
+                    [(cur.lastrowid, t) for t in targets],
+                )
+
+    def _redact(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        secrets = _secrets(params)
+        return {
+            k: "hmac-sha256:" + hmac.new(self._key, str(v).encode(), hashlib.sha256).hexdigest()[:16]
+            if k in secrets else v
+            for k, v in params.items()
+        }
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def query(
+        self,
+        target: Optional[str] = None,
+        connector: Optional[str] = None,
+        submodule: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        sql = "SELECT DISTINCT c.* FROM commands c"
+        where, args = [], []
+        if target:
+            sql += " JOIN targets t ON t.command_id = c.id"
+            where.append("t.target = ?")
+            args.append(target)
+        if connector:
+            where.append("c.connector = ?")
+            args.append(connector)
+        if submodule:
+            where.append("c.submodule = ?")
+            args.append(submodule)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.ts DESC LIMIT ?"
+        args.append(limit)
+
+        rows = self._connect().execute(sql, args).fetchall()
+        return [
+            {
+                "ts": r["ts"],
+                "connector": r["connector"],
+                "submodule": r["submodule"],
+                "params": json.loads(r["params"]),
+                "command": r["command"],
+            }
+            for r in rows
+        ]
+
+
+def init_history(path: Optional[str]) -> Optional[HistoryStore]:
+    global _STORE
+    _STORE = HistoryStore(path) if path else None
+    return _STORE
+
+
+def get_history() -> Optional[HistoryStore]:
+    return _STORE
@@ -0,0 +1,337 @@
+import io
+import json
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, IO, Iterator, List, Mapping, Optional, Set, Type
+from connectors.base import Module
+from services.render import render
+
+CHUNK_SIZE = 1 << 20
+
+# which hosts each connector is rendered for, and which globals they fill in
+RULES: Dict[str, Dict[str, Any]] = {
+    "SMB": {"port": 445, "fields": {"host": "address"}},
+    "Delegations": {"role": "dc", "fields": {"dc_host": "address", "domain": "domain"}},
+    "BloodHound": {"role": "dc", "fields": {"domain": "domain"}},
+}
+
+_NMAP_DOMAIN = re.compile(r"Domain: ([\w.-]+?)0?\.?(?:,|$)")
+# keys only BloodHound computer objects carry, users and groups have PrimaryGroupSID as well
+_BH_COMPUTER_KEYS = ("LocalAdmins", "Sessions", "AllowedToAct", "IsDC")
+_BH_COMPUTER_PROPS = ("operatingsystem", "haslaps")
+
+
+@dataclass
+class Host:
+    address: str
+    names: Set[str] = field(default_factory=set)
+    ports: Dict[int, str] = field(default_factory=dict)
+    roles: Set[str] = field(default_factory=set)
+    domain: str = ""
+
+    def value(self, attr: str) -> Any:
+        if attr == "name":
+            return min(self.names) if self.names else self.address
+        return getattr(self, attr)
+
+
+class Inventory:
+    """Hosts keyed by address, indexed by open port, service name, role and hostname."""
+
+    def __init__(self):
+        self.hosts: Dict[str, Host] = {}
+        self.domains: Set[str] = set()
+        self.by_port: Dict[int, Set[str]] = defaultdict(set)
+        self.by_service: Dict[str, Set[str]] = defaultdict(set)
+        self.by_role: Dict[str, Set[str]] = defaultdict(set)
+        self.by_name: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def add(
+        self,
+        address: Optional[str] = None,
+        names=(),
+        ports: Optional[Mapping[int, str]] = None,
+        roles=(),
+        domain: str = "",
+    ) -> Host:
+        """Merges what is known about one host, matching on address first and any hostname second."""
+        names = {n.lower().rstrip(".") for n in names if n}
+        if not address and not names:
+            raise ValueError("a host needs an address or a name")
+
+        key = address if address in self.hosts else None
+        if key is None:
+            known = next((self.by_name[n] for n in sorted(names) if n in self.by_name), None)
+            # a host only known by name so far takes the address once one turns up
+            if known is not None and (address is None or known in self.hosts[known].names):
+                key = known
+                if address is not None:
+                    self._rekey(known, address)
+                    key = address
+        if key is None:
+            key = address or min(names)
+
+        host = self.hosts.get(key)
+        if host is None:
+            host = self.hosts[key] = Host(key)
+
+        host.names |= names
+        for n in names:
+            self.by_name.setdefault(n, key)
+        for port, service in (ports or {}).items():
+            host.ports[port] = service or host.ports.get(port, "")
+            self.by_port[port].add(key)
+            if service:
+                self.by_service[service].add(key)
+        for role in roles:
+            host.roles.add(role)
+            self.by_role[role].add(key)
+
+        domain = domain.lower().rstrip(".")
+        if not domain and not host.domain:
+            domain = next((n.split(".", 1)[1] for n in sorted(names) if "." in n and not n[0].isdigit()), "")
+        if domain:
+            host.domain = domain
+            self.domains.add(domain)
+        return host
+
+    def _rekey(self, old: str, new: str) -> None:
+        host = self.hosts.pop(old)
+        host.address = new
+        self.hosts[new] = host
+        for index, values in (
+            (self.by_port, host.ports),
+            (self.by_service, [s for s in host.ports.values() if s]),
+            (self.by_role, host.roles),
+        ):
+            for v in values:
+                index[v].discard(old)
+                index[v].add(new)
+        for n in host.names:
+            if self.by_name.get(n) == old:
+                self.by_name[n] = new
+
+    def select(self, port: Optional[int] = None, service: Optional[str] = None, role: Optional[str] = None) -> List[Host]:
+        keys: Optional[Set[str]] = None
+        for index, value in ((self.by_port, port), (self.by_service, service), (self.by_role, role)):
+            if value is None:
+                continue
+            matched = index.get(value, set())
+            keys = set(matched) if keys is None else keys & matched
+        if keys is None:
+            keys = set(self.hosts)
+        return [self.hosts[k] for k in sorted(keys)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "hosts": len(self.hosts),
+            "domains": sorted(self.domains),
+            "ports": {p: len(k) for p, k in sorted(self.by_port.items())},
+            "roles": {r: len(k) for r, k in sorted(self.by_role.items())},
+        }
+
+
+def import_nmap(source, inventory: Inventory) -> int:
+    """Streams hosts out of nmap -oX output, clearing each element once read so memory stays flat."""
+    count = 0
+    context = ET.iterparse(source, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "host":
+            continue
+
+        status = elem.find("status")
+        if status is None or status.get("state") == "up":
+            address = None
+            for addr in elem.iter("address"):
+                if addr.get("addrtype") in ("ipv4", "ipv6"):
+                    address = addr.get("addr")
+                    break
+            names = [h.get("name") for h in elem.iter("hostname")]
+
+            ports, domain = {}, ""
+            for port in elem.iter("port"):
+                state = port.find("state")
+                if state is None or state.get("state") != "open":
+                    continue
+                service = port.find("service")
+                ports[int(port.get("portid"))] = service.get("name", "") if service is not None else ""
+                m = _NMAP_DOMAIN.search(service.get("extrainfo", "")) if service is not None else None
+                if m and not domain:
+                    domain = m.group(1)
+
+            roles = {"dc"} if 88 in ports and (389 in ports or 636 in ports) else set()
+            if address or names:
+                inventory.add(address, names, ports, roles, domain)
+                count += 1
+        root.clear()
+    return count
+
+
+def _iter_json_array(f: IO[str], key: str = "data") -> Iterator[Any]:
+    """
+    Yields the items of the array under a top-level key one at a time. Other top-level values are
+    decoded whole, so this stays in constant memory as long as only that array is large.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str) -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n" + chars:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos] if pos < len(buf) else ""
+
+    def value() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(buf) or eof:
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    if skip("") != "{":
+        raise ValueError("expected a JSON object")
+    pos += 1
+    while skip(",") not in ("}", ""):
+        name = value()
+        if skip("") != ":":
+            raise ValueError("expected ':' in JSON object")
+        pos += 1
+        if skip("") == "[" and name == key:
+            pos += 1
+            while skip(",") not in ("]", ""):
+                yield value()
+            pos += 1
+        else:
+            value()
+
+
+def _bloodhound_items(source) -> Iterator[Any]:
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            for name in zf.namelist():
+                if name.lower().endswith(".json"):
+                    with io.TextIOWrapper(zf.open(name), encoding="utf-8-sig") as f:
+                        yield from _iter_json_array(f)
+        return
+    with open(source, encoding="utf-8-sig") as f:
+        yield from _iter_json_array(f)
+
+
+def import_bloodhound(source, inventory: Inventory) -> int:
+    """Reads computers and domains out of BloodHound collector output, a .json file or the collection .zip."""
+    count = 0
+    for item in _bloodhound_items(source):
+        if not isinstance(item, dict):
+            continue
+        props = item.get("Properties") or {}
+        domain = props.get("domain") or ""
+
+        if any(k in item for k in _BH_COMPUTER_KEYS) or any(k in props for k in _BH_COMPUTER_PROPS):
+            name = props.get("name") or ""
+            if not name:
+                continue
+            # 516 is the Domain Controllers group
+            is_dc = item.get("IsDC") or props.get("isdc") or str(item.get("PrimaryGroupSID") or "").endswith("-516")
+            inventory.add(None, [name], roles={"dc"} if is_dc else (), domain=domain)
+            count += 1
+        elif "Trusts" in item and domain:
+            inventory.domains.add(domain.lower())
+    return count
+
+
+def import_hosts(source, inventory: Inventory) -> int:
+    """One host per line, an address optionally followed by hostnames as in /etc/hosts. # starts a comment."""
+    count = 0
+    with open(source) as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if not parts:
+                continue
+            inventory.add(parts[0], parts[1:])
+            count += 1
+    return count
+
+
+def import_file(path: str, inventory: Inventory) -> int:
+    """Picks the importer from the file's extension and, for .xml and .json, its first bytes."""
+    lower = path.lower()
+    if lower.endswith(".zip"):
+        return import_bloodhound(path, inventory)
+    with open(path, "rb") as f:
+        head = f.read(512).lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith(b"<"):
+        return import_nmap(path, inventory)
+    if head.startswith(b"{"):
+        return import_bloodhound(path, inventory)
+    return import_hosts(path, inventory)
+
+
+def plan(
+    inventory: Inventory,
+    connectors: Mapping[str, Type[Module]],
+    base: Optional[Dict[str, Any]] = None,
+    rules: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yields the globals for every connector and every inventory host its rule selects, once per distinct set."""
+    for name, rule in (rules or RULES).items():
+        if name not in connectors:
+            continue
+        seen = set()
+        for host in inventory.select(rule.get("port"), rule.get("service"), rule.get("role")):
+            data = dict(base or {})
+            for param, attr in rule["fields"].items():
+                value = host.value(attr)
+                if value:
+                    data[param] = value
+            # e.g. BloodHound only takes the domain, so every DC of a domain renders the same
+            key = json.dumps(data, sort_keys=True, default=str)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield {"connector": name, "target": host.address, "params": data}
+
+
+def render_inventory(
+    inventory: Inventory,
+    connectors: Mapping[str, Type[Module]],
+    base: Optional[Dict[str, Any]] = None,
+    subs: Optional[Set[str]] = None,
+    rules: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    for item in plan(inventory, connectors, base, rules):
+        cls = connectors[item["connector"]]
+        for sub in cls.sub_modules:
+            if subs and sub not in subs:
+                continue
+            result = {"connector": item["connector"], "sub": sub, "target": item["target"]}
+            try:
+                result["command"] = render(cls, sub, dict(item["params"]))
+            except Exception as e:
+                result["error"] = str(e)
+            yield result
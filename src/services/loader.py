@@ -1,22 +1,99 @@
+import hashlib
 import os
 import importlib
+import importlib.util
+import re
+import sys
+import zipfile
+from typing import Iterable, Union
+import connectors
 from connectors.base import get_registered_modules
+from services.bundles import PACKAGE, ConnectorBundle, ConnectorCatalogue
+from config import Config
 
 _CONNECTORS = None
+_PACKAGE_PATH = os.path.realpath(os.path.dirname(connectors.__file__))
 
 
-def load_connectors(pkg_path: str):
-    global _CONNECTORS
-    for f in os.listdir(pkg_path):
+def _import_file(pkg_path: str, f: str) -> str:
+    real = os.path.realpath(pkg_path)
+    if real == _PACKAGE_PATH:
+        return importlib.import_module(f"{PACKAGE}.{f[:-3]}").__name__
+
+    # loose files from other directories are imported as children of the connectors package too,
+    # so `from .base import ...` resolves; a hash of the full path keeps same-named directories apart
+    safe = re.sub(r"\W", "_", os.path.basename(real))
+    digest = hashlib.sha1(real.encode()).hexdigest()[:8]
+    fullname = f"{PACKAGE}._dir_{safe}_{digest}__{f[:-3]}"
+    if fullname in sys.modules:
+        return fullname
+    spec = importlib.util.spec_from_file_location(fullname, os.path.join(pkg_path, f))
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[fullname] = mod
+    try:
+        spec.loader.exec_module(mod)
+    except BaseException:
+        del sys.modules[fullname]
+        raise
+    return fullname
+
+
+def _load_directory(pkg_path: str, catalogue: ConnectorCatalogue):
+    try:
+        files = sorted(os.listdir(pkg_path))
+    except OSError as e:
+        print(f"- skipping connector directory {pkg_path}: {e}")
+        return
+
+    modules = set()
+    for f in files:
         if f.endswith(".py") and f != "__init__.py":
-            module_name = f"{os.path.basename(pkg_path)}.{f[:-3]}"
-            importlib.import_module(module_name)
+            try:
+                modules.add(_import_file(pkg_path, f))
+            except Exception as e:
+                print(f"- skipping connector {os.path.join(pkg_path, f)}: {type(e).__name__}: {e}")
+
+    for name, cls in get_registered_modules().items():
+        if cls.__module__ in modules:
+            catalogue.add(name, cls)
+
+    for f in files:
+        if f.endswith(".zip"):
+            _load_bundle(os.path.join(pkg_path, f), catalogue)
+
+
+def _load_bundle(path: str, catalogue: ConnectorCatalogue):
+    try:
+        bundle = ConnectorBundle(path)
+    except (ImportError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        print(f"- skipping connector bundle {path}: {e}")
+        return
+
+    for entry in bundle.connectors:
+        if entry["name"] in catalogue:
+            print(f"- {bundle.name} {bundle.version}: {entry['name']} is already loaded, skipping")
+            continue
+        catalogue.add_lazy(entry["name"], bundle.loader(entry), entry.get("description"))
+
+
+def load_connectors(paths: Union[str, Iterable[str]]):
+    global _CONNECTORS
+    if isinstance(paths, str):
+        paths = [paths]
+
+    # earlier search paths win when two provide the same connector
+    catalogue = ConnectorCatalogue()
+    for path in paths:
+        if path.endswith(".zip"):
+            _load_bundle(path, catalogue)
+        else:
+            _load_directory(path, catalogue)
     
-    _CONNECTORS = get_registered_modules()
+    _CONNECTORS = catalogue
     return _CONNECTORS
 
 def get_connectors():
     global _CONNECTORS
     if _CONNECTORS is None:
-        load_connectors()
-    return _CONNECTORS
\ No newline at end of file
+        load_connectors(Config.CONNECTOR_PATHS)
+    return _CONNECTORS
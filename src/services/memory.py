@@ -0,0 +1,144 @@
+import inspect
+import sys
+import threading
+import tracemalloc
+import types
+from typing import Any, Dict, List, Mapping, Optional, Type
+from connectors.base import Module
+from services.cache import get_cache
+from services.parser import build_connector_description
+from services import warmup
+
+_SNAPSHOT = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def deep_size(obj: Any) -> int:
+    """Rough retained size of obj, following containers, attributes and functions but not other classes or modules."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if o is None or id(o) in seen:
+            continue
+        if o is not obj and isinstance(o, (type, types.ModuleType)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o, 0)
+
+        if isinstance(o, (dict, types.MappingProxyType)):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, types.FunctionType):
+            stack.extend([o.__code__, o.__doc__, o.__defaults__, o.__kwdefaults__, o.__dict__])
+        elif isinstance(o, types.CodeType):
+            stack.extend(o.co_consts)
+        elif isinstance(o, inspect.Signature):
+            stack.append(dict(o.parameters))
+        elif isinstance(o, inspect.Parameter):
+            stack.extend([o.name, o.default])
+        elif isinstance(o, type):
+            stack.append(vars(o))
+        elif hasattr(o, "__dict__") and not isinstance(o, (str, bytes)):
+            stack.append(vars(o))
+    return total
+
+
+def connector_usage(name: str, cls: Type[Module]) -> Dict[str, int]:
+    desc = build_connector_description({name: cls})[name]
+    docs = [sub.pop("doc", "") for sub in desc["subs"]]
+    report = warmup.get_report() or {"results": []}
+
+    usage = {
+        "class": deep_size(cls),
+        "schema": deep_size(desc),
+        "docs": deep_size(docs),
+        "warmup": deep_size([r for r in report["results"] if r["connector"] == name]),
+    }
+    usage["total"] = sum(usage.values())
+    return usage
+
+
+def memory_report(connectors: Mapping[str, Type[Module]], budget: Optional[int] = None) -> Dict[str, Any]:
+    is_loaded = getattr(connectors, "is_loaded", lambda name: True)
+    cache = get_cache()
+    cache_usage = cache.usage_by_connector() if cache is not None else {}
+
+    per_connector: Dict[str, Any] = {}
+    for name in connectors:
+        if not is_loaded(name):
+            # reporting must not be what imports a bundled connector
+            per_connector[name] = {"loaded": False}
+            continue
+        usage = connector_usage(name, connectors[name])
+        count, nbytes = cache_usage.get(name, (0, 0))
+        usage["cache"] = nbytes
+        usage["cache_entries"] = count
+        usage["total"] += nbytes
+        per_connector[name] = usage
+
+    total = sum(c.get("total", 0) for c in per_connector.values())
+    report = {
+        "connectors": per_connector,
+        "total": total,
+        "cache": {
+            "entries": len(cache) if cache is not None else 0,
+            "bytes": cache.nbytes if cache is not None else 0,
+            "max_bytes": cache.max_bytes if cache is not None else None,
+        },
+        "tracemalloc": None,
+    }
+    if budget is not None:
+        report["budget"] = budget
+        report["over_budget"] = total > budget
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report["tracemalloc"] = {"current": current, "peak": peak}
+    return report
+
+
+def snapshot_diff(top: int = 20, group_by: str = "lineno") -> Optional[List[Dict[str, Any]]]:
+    """Takes a tracemalloc snapshot and returns the top allocation changes since the previous one."""
+    global _SNAPSHOT
+    if not tracemalloc.is_tracing():
+        return None
+
+    snap = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    with _SNAPSHOT_LOCK:
+        prev, _SNAPSHOT = _SNAPSHOT, snap
+
+    if prev is None:
+        stats = snap.statistics(group_by)[:top]
+        return [
+            {"where": str(s.traceback), "size": s.size, "count": s.count}
+            for s in stats
+        ]
+    return [
+        {"where": str(s.traceback), "size": s.size, "size_diff": s.size_diff, "count_diff": s.count_diff}
+        for s in snap.compare_to(prev, group_by)[:top]
+    ]
+
+
+def format_report(report: Dict[str, Any], printer: callable = print) -> None:
+    printer(f"{'connector':<24} {'class':>10} {'schema':>10} {'docs':>10} {'cache':>10} {'warmup':>10} {'total':>10}")
+    for name, c in report["connectors"].items():
+        if not c.get("loaded", True):
+            printer(f"{name:<24} {'(not loaded)':>10}")
+            continue
+        printer(
+            f"{name:<24} {c['class']:>10} {c['schema']:>10} {c['docs']:>10} "
+            f"{c['cache']:>10} {c['warmup']:>10} {c['total']:>10}"
+        )
+    printer(f"{'total':<24} {report['total']:>65}")
+    if "budget" in report:
+        state = "OVER" if report["over_budget"] else "ok"
+        printer(f"budget: {report['budget']} bytes ({state})")
+    if report["tracemalloc"]:
+        printer(f"tracemalloc: current {report['tracemalloc']['current']} peak {report['tracemalloc']['peak']}")
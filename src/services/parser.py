@@ -1,4 +1,5 @@
-from typing import get_type_hints, ClassVar, Dict, Any, List
+from typing import get_type_hints, ClassVar, Dict, Any, List, Mapping
+import copy
 import inspect
 import markdown
 
@@ -52,12 +53,23 @@ def pretty_print(connectors: Dict[str, Any], printer: callable = print) -> None:
                 
                 if not has_params:
                     printer("│        (No parameters)")
+
+                for c in cls._submodule_constraints.get(key, ()):
+                    printer(f"│      ! {c.kind}: {c.message}")
         printer("└" + "─" * 40)
 
 
-def build_connector_description(connectors: Dict[str, Any]) -> Dict[str, Any]:
+def build_connector_description(connectors: Mapping[str, Any]) -> Dict[str, Any]:
+    is_loaded = getattr(connectors, "is_loaded", lambda name: True)
     desc: Dict[str, Any] = {}
-    for name, cls in connectors.items():
+    for name in connectors:
+        # bundled connectors are described from their manifest until something renders them
+        stored = connectors.description(name) if not is_loaded(name) else None
+        if stored is not None:
+            desc[name] = copy.deepcopy(stored)
+            continue
+
+        cls = connectors[name]
         hints = get_type_hints(cls, include_extras=True)
         globals_ = _extract_global_fields(cls, hints)
         subs = _extract_submodule_fields(cls, globals_)
@@ -100,5 +112,6 @@ def _extract_submodule_fields(cls: Any, globals_: List[Dict[str, Any]]) -> List[
             for p in sig.parameters.values()
             if p.name not in global_names
         ]
-        subs.append({"key": key, "extras": extras})
+        constraints = [c.to_dict() for c in cls._submodule_constraints.get(key, ())]
+        subs.append({"key": key, "extras": extras, "constraints": constraints})
     return subs
\ No newline at end of file
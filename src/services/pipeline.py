@@ -0,0 +1,127 @@
+import json
+import re
+from graphlib import TopologicalSorter, CycleError
+from typing import Any, Dict, List, Optional, Tuple, Type
+from connectors.base import Module
+from services.render import split_params
+
+# "{{step}}" is the rendered output of a step, "{{step.param}}" one of its resolved parameters
+_REF = re.compile(r"\{\{\s*([\w-]+)(?:\.(\w+))?\s*\}\}")
+
+
+def _key(d: Dict[str, Any]) -> str:
+    return json.dumps(d, sort_keys=True, default=str)
+
+
+def _refs(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [m.group(1) for m in _REF.finditer(value)]
+    return []
+
+
+class Pipeline:
+    def __init__(self, steps: List[Dict[str, Any]], globals_: Optional[Dict[str, Any]] = None):
+        if not isinstance(steps, list):
+            raise ValueError("steps must be a list of objects")
+        if globals_ is not None and not isinstance(globals_, dict):
+            raise ValueError("globals must be an object")
+        self.globals = dict(globals_ or {})
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+        for i, step in enumerate(steps):
+            if not isinstance(step, dict):
+                raise ValueError(f"step {i} must be an object")
+            sid = step.get("id", i)
+            if not isinstance(sid, (str, int)) or isinstance(sid, bool):
+                raise ValueError(f"step {i} has an id that is not a string")
+            sid = str(sid)
+            if sid in self.steps:
+                raise ValueError(f"duplicate step id '{sid}'")
+            if not step.get("connector") or not step.get("sub"):
+                raise ValueError(f"step '{sid}' needs a connector and a sub")
+            if not isinstance(step["connector"], str) or not isinstance(step["sub"], str):
+                raise ValueError(f"step '{sid}' has a connector or sub that is not a string")
+            if not isinstance(step.get("params", {}), dict):
+                raise ValueError(f"step '{sid}' params must be an object")
+            after = step.get("after", [])
+            if not isinstance(after, list) or not all(isinstance(a, str) for a in after):
+                raise ValueError(f"step '{sid}' after must be a list of step ids")
+            self.steps[sid] = step
+
+        self._graph: Dict[str, set] = {}
+        for sid, step in self.steps.items():
+            deps = set(step.get("after", []))
+            for value in step.get("params", {}).values():
+                deps.update(_refs(value))
+            unknown = deps - self.steps.keys()
+            if unknown:
+                raise ValueError(f"step '{sid}' depends on unknown step(s): {', '.join(sorted(unknown))}")
+            self._graph[sid] = deps
+
+        try:
+            self.order = list(TopologicalSorter(self._graph).static_order())
+        except CycleError as e:
+            raise ValueError(f"pipeline has a cycle: {' -> '.join(map(str, e.args[1]))}")
+
+    @classmethod
+    def from_dict(cls, definition: Dict[str, Any]) -> "Pipeline":
+        if not isinstance(definition, dict):
+            raise ValueError("expected an object with steps")
+        return cls(definition.get("steps", []), definition.get("globals"))
+
+    def render(self, connectors: Dict[str, Type[Module]]) -> List[Dict[str, Any]]:
+        instances: Dict[Tuple[str, str], Module] = {}
+        memo: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for sid in self.order:
+            step = self.steps[sid]
+            result = {"id": sid, "connector": step["connector"], "sub": step["sub"]}
+            results[sid] = result
+
+            cls = connectors.get(step["connector"])
+            if not cls or step["sub"] not in cls.sub_modules:
+                result["error"] = "unknown"
+                continue
+
+            failed = [d for d in self._graph[sid] if "error" in results[d]]
+            if failed:
+                result["error"] = f"depends on failed step(s): {', '.join(sorted(failed))}"
+                continue
+
+            params = dict(self.globals)
+            params.update({k: self._resolve(v, results) for k, v in step.get("params", {}).items()})
+
+            global_kwargs, extras = split_params(cls, params)
+            ikey = (cls.name, _key(global_kwargs))
+            mkey = ikey + (step["sub"], _key(extras))
+
+            try:
+                if ikey not in instances:
+                    instances[ikey] = cls(**global_kwargs)
+                inst = instances[ikey]
+                # later steps can reference the effective globals, defaults included
+                result["params"] = {**inst.get_params(), **params}
+                if mkey not in memo:
+                    memo[mkey] = {"command": inst.run_sub_module(step["sub"], **extras)}
+                result.update(memo[mkey])
+            except Exception as e:
+                result["error"] = str(e)
+
+        return [results[sid] for sid in self.steps]
+
+    def _resolve(self, value: Any, results: Dict[str, Dict[str, Any]]) -> Any:
+        if not isinstance(value, str):
+            return value
+
+        def lookup(m: "re.Match") -> Any:
+            step, attr = results[m.group(1)], m.group(2)
+            if attr is None:
+                return step.get("command")
+            return step.get("params", {}).get(attr)
+
+        whole = _REF.fullmatch(value.strip())
+        if whole:
+            # keep the referenced value's type, e.g. booleans stay booleans
+            return lookup(whole)
+        return _REF.sub(lambda m: str(lookup(m)), value)
@@ -0,0 +1,139 @@
+import copy
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+from connectors.base import Module
+from services.history import SECRET_FIELDS
+from services.render import global_fields, split_params
+
+_STORE = None
+_UNSET = object()
+
+
+class Profile:
+    """
+    Global values shared by everyone who holds the id, with one pre-built instance per connector.
+    Published instances are never mutated: a change copies the affected instances, sets the new values
+    on the copies and swaps the whole state in at once, so readers get a consistent snapshot without
+    taking the lock.
+    """
+
+    def __init__(self, profile_id: str, values: Dict[str, Any]):
+        self.id = profile_id
+        self.version = 0
+        # values, instances and the per-connector params derived from them, published together
+        # as one tuple so a reader never pairs the values of one version with another's instances
+        self._state: Tuple[Dict[str, Any], Dict[str, Module], Dict[str, Dict[str, Any]]] = ({}, {}, {})
+        self._lock = threading.Lock()
+        self.update(values)
+
+    def update(self, changes: Dict[str, Any]) -> bool:
+        """Merges changes into the profile, a None value drops the field back to its default."""
+        with self._lock:
+            current, instances, _ = self._state
+            # keystrokes resend globals that did not change, those must not copy anything
+            changes = {
+                k: v for k, v in changes.items()
+                if (k in current if v is None else current.get(k, _UNSET) != v)
+            }
+            if not changes:
+                return False
+
+            values = dict(current)
+            for k, v in changes.items():
+                if v is None:
+                    values.pop(k, None)
+                else:
+                    values[k] = v
+
+            copies = {}
+            for name, inst in instances.items():
+                cls = type(inst)
+                changed = changes.keys() & global_fields(cls)
+                if changed:
+                    inst = copy.copy(inst)
+                    for k in changed:
+                        setattr(inst, k, values.get(k, getattr(cls, k, None)))
+                copies[name] = inst
+
+            self._state = (values, copies, {})
+            self.version += 1
+            return True
+
+    def apply(self, cls: Type[Module], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Takes the globals sent along with a request into the profile and returns the remaining extras."""
+        global_kwargs, extras = split_params(cls, data)
+        if global_kwargs:
+            self.update(global_kwargs)
+        return extras
+
+    def snapshot(self, cls: Type[Module]) -> Tuple[Dict[str, Any], Module]:
+        """
+        The profile's values for the globals of cls and the instance built from those same values.
+        Cache keys, renders and history records must all come from one snapshot.
+        """
+        state = self._state
+        values, instances, cached = state
+        params = cached.get(cls.name)
+        if params is None:
+            fields = global_fields(cls)
+            params = {k: v for k, v in values.items() if k in fields}
+        inst = instances.get(cls.name)
+        if inst is None or type(inst) is not cls:
+            inst = cls(**params)
+            instances = {**instances, cls.name: inst}
+        if instances is not state[1] or cls.name not in cached:
+            with self._lock:
+                # only published if no update landed in the meantime, the caller keeps its pair either way
+                if self._state is state:
+                    self._state = (values, instances, {**cached, cls.name: params})
+        return dict(params), inst
+
+    def masked(self) -> Dict[str, Any]:
+        with self._lock:
+            values = {
+                k: "***" if k.lower() in SECRET_FIELDS and v not in ("", False) else v
+                for k, v in self._state[0].items()
+            }
+            version = self.version
+        return {"id": self.id, "version": version, "globals": values}
+
+
+class ProfileStore:
+    def __init__(self, max_profiles: int = 1024):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def create(self, values: Dict[str, Any]) -> Profile:
+        profile = Profile(secrets.token_urlsafe(16), values)
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            profile = self._profiles.get(profile_id)
+            if profile is not None:
+                self._profiles.move_to_end(profile_id)
+            return profile
+
+    def delete(self, profile_id: str) -> bool:
+        with self._lock:
+            return self._profiles.pop(profile_id, None) is not None
+
+
+def init_profiles(max_profiles: int) -> ProfileStore:
+    global _STORE
+    _STORE = ProfileStore(max_profiles)
+    return _STORE
+
+
+def get_profiles() -> Optional[ProfileStore]:
+    return _STORE
@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Tuple, Type, get_type_hints, ClassVar
+from connectors.base import Module
+
+
+@lru_cache(maxsize=None)
+def global_fields(cls: Type[Module]) -> FrozenSet[str]:
+    hints = get_type_hints(cls, include_extras=True)
+    return frozenset(
+        k for k, t in hints.items()
+        if getattr(t, "__origin__", None) is not ClassVar
+    )
+
+
+def split_params(cls: Type[Module], data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    fields = global_fields(cls)
+    global_kwargs = {k: v for k, v in data.items() if k in fields}
+    extras = {k: v for k, v in data.items() if k not in fields}
+    return global_kwargs, extras
+
+
+def render(cls: Type[Module], sub: str, data: Dict[str, Any], check: bool = True) -> Any:
+    global_kwargs, extras = split_params(cls, data)
+    inst = cls(**global_kwargs)
+    if check:
+        return inst.run_sub_module(sub, **extras)
+    # for callers that evaluate the constraints themselves, e.g. compiled static templates
+    return inst.sub_modules[sub](inst, **inst.bind_sub_module(sub, extras))
@@ -0,0 +1,217 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Type
+from jinja2 import Environment, FileSystemLoader
+from connectors.base import Module
+from services.assets import build_assets
+from services.parser import build_connector_description
+from services.render import render
+
+# above this many branch dimensions a submodule is left to the /preview fallback
+MAX_DIMENSIONS = 14
+
+# private-use code points, so probe values cannot collide with literal output
+_PROBES = ("\ue000{}\ue001", "\ue002{}x{}\ue003")
+_PROBE_CHARS = re.compile("[\ue000-\ue003]")
+
+
+def _probe(i: int, variant: int) -> str:
+    return _PROBES[variant].format(i, i)
+
+
+def _segments(output: str, params: List[str], variant: int) -> Optional[List[Any]]:
+    """Splits output into literal strings and parameter indices, or None if a probe was mangled."""
+    probes = {_probe(i, variant): i for i, name in enumerate(params)}
+    pattern = re.compile("|".join(re.escape(p) for p in probes)) if probes else None
+
+    segments: List[Any] = []
+    pos = 0
+    for m in (pattern.finditer(output) if pattern else []):
+        if m.start() > pos:
+            segments.append(output[pos:m.start()])
+        segments.append(probes[m.group(0)])
+        pos = m.end()
+    if pos < len(output):
+        segments.append(output[pos:])
+
+    if any(isinstance(s, str) and _PROBE_CHARS.search(s) for s in segments):
+        return None
+    return segments
+
+
+def compile_template(cls: Type[Module], sub: str, fields: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Compiles a submodule into a table of output templates that app.js can fill in without a server.
+
+    Every bool is a branch dimension, and so is whether each other field is filled in (an empty field
+    is not sent, so the declared default applies). Each combination is rendered twice with different
+    probe values; if both renders split into the same literals around the probes, the output only
+    depends on the values by substitution. A third render with the declared defaults guards against
+    branches that compare a value to a constant. Otherwise None is returned. Constraints are not
+    checked here, app.js evaluates them before filling in a template.
+    """
+    params = [f["name"] for f in fields]
+    is_bool = [f["type"] == "bool" for f in fields]
+    samples = [str(f["default"]) if f["default"] not in ("", None) else "x" for f in fields]
+    if len(params) > MAX_DIMENSIONS:
+        return None
+
+    cells: Dict[int, List[Any]] = {}
+    for bits in range(1 << len(params)):
+        renders = []
+        for variant in (0, 1):
+            data = {}
+            for i, name in enumerate(params):
+                on = bool(bits >> i & 1)
+                if is_bool[i]:
+                    data[name] = on
+                elif on:
+                    data[name] = _probe(i, variant)
+            try:
+                output = render(cls, sub, data, check=False)
+            except Exception:
+                return None
+            if not isinstance(output, str):
+                return None
+            renders.append(_segments(output, params, variant))
+
+        if renders[0] is None or renders[0] != renders[1]:
+            return None
+
+        data = {
+            name: bool(bits >> i & 1) if is_bool[i] else samples[i]
+            for i, name in enumerate(params)
+            if is_bool[i] or bits >> i & 1
+        }
+        expected = "".join(s if isinstance(s, str) else samples[s] for s in renders[0])
+        try:
+            if render(cls, sub, data, check=False) != expected:
+                return None
+        except Exception:
+            return None
+
+        cells[bits] = renders[0]
+
+    defaults = [str(f["default"]) for f in fields]
+    dims = _reduce(cells, list(range(len(params))), is_bool, defaults)
+
+    templates: List[List[Any]] = []
+    seen: Dict[str, int] = {}
+    index: List[int] = []
+    for bits in range(1 << len(dims)):
+        key = json.dumps(cells[bits])
+        if key not in seen:
+            seen[key] = len(templates)
+            templates.append(cells[bits])
+        index.append(seen[key])
+
+    return {
+        "params": params,
+        "bools": is_bool,
+        "defaults": defaults,
+        "dims": dims,
+        "templates": templates,
+        "index": index,
+    }
+
+
+def _substitute(segments: List[Any], i: int, value: str) -> List[Any]:
+    out: List[Any] = []
+    for s in segments:
+        if s == i and not isinstance(s, str):
+            s = value
+        if isinstance(s, str) and out and isinstance(out[-1], str):
+            out[-1] += s
+        elif s != "":
+            out.append(s)
+    return out
+
+
+def _reduce(cells: Dict[int, List[Any]], dims: List[int], is_bool: List[bool], defaults: List[str]) -> List[int]:
+    """
+    Drops branch dimensions that never change the output: bools that render the same either way, and
+    fields where leaving them empty renders the same as substituting their default. Rewrites cells in place.
+    """
+    k = 0
+    while k < len(dims):
+        i = dims[k]
+        bit = 1 << k
+        redundant = all(
+            cells[bits] == (
+                cells[bits | bit] if is_bool[i]
+                else _substitute(cells[bits | bit], i, defaults[i])
+            )
+            for bits in cells if not bits & bit
+        )
+        if not redundant:
+            k += 1
+            continue
+
+        low = bit - 1
+        rekeyed = {
+            (bits & low) | ((bits >> (k + 1)) << k): cell
+            for bits, cell in cells.items() if bits & bit
+        }
+        cells.clear()
+        cells.update(rekeyed)
+        del dims[k]
+    return dims
+
+
+def _slug(*parts: str) -> str:
+    return "-".join(re.sub(r"[^a-z0-9]+", "-", p.lower()).strip("-") for p in parts)
+
+
+def build_static(
+    connectors: Dict[str, Type[Module]],
+    template_path: str,
+    static_path: str,
+    out_dir: str,
+    preview_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    desc = build_connector_description(connectors)
+    os.makedirs(os.path.join(out_dir, "docs"), exist_ok=True)
+
+    templates: Dict[str, Dict[str, Any]] = {}
+    fallback: List[str] = []
+    total = 0
+
+    for name, connector in desc.items():
+        cls = connectors[name]
+        templates[name] = {}
+        for sub in connector["subs"]:
+            doc_file = f"docs/{_slug(name, sub['key'])}.html"
+            with open(os.path.join(out_dir, doc_file), "w") as f:
+                f.write(sub.pop("doc"))
+            sub["doc_url"] = doc_file
+
+            compiled = compile_template(cls, sub["key"], connector["globals"] + sub["extras"])
+            if compiled is None:
+                fallback.append(f"{name} / {sub['key']}")
+            else:
+                templates[name][sub["key"]] = compiled
+            total += 1
+
+    manifest = build_assets(static_path, os.path.join(out_dir, "assets"))
+
+    with open(os.path.join(out_dir, "preview-templates.js"), "w") as f:
+        f.write("window.syntacTemplates = ")
+        json.dump(templates, f, separators=(",", ":"))
+        f.write(";\n")
+
+    env = Environment(loader=FileSystemLoader(template_path), autoescape=True)
+    html = env.get_template("index.html").render(
+        connectors=desc,
+        static_build={"previewUrl": preview_url},
+        asset_url=lambda filename: f"assets/{manifest.get(filename, filename)}",
+    )
+    with open(os.path.join(out_dir, "index.html"), "w") as f:
+        f.write(html)
+
+    return {
+        "connectors": len(desc),
+        "submodules": total,
+        "compiled": total - len(fallback),
+        "fallback": fallback,
+    }
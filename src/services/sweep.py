@@ -0,0 +1,68 @@
+import itertools
+from typing import Any, Dict, Iterator, List, Type
+from connectors.base import Module
+from services.render import render
+
+MAX_COMBINATIONS = 100000
+MAX_DISTINCT = 1000
+# parameter sets kept per distinct command, the rest are only counted
+MAX_PARAMS_PER_COMMAND = 32
+
+
+def sweep(
+    cls: Type[Module],
+    sub: str,
+    fixed: Dict[str, Any],
+    values: Dict[str, List[Any]],
+    max_combinations: int = MAX_COMBINATIONS,
+    max_distinct: int = MAX_DISTINCT,
+    max_params: int = MAX_PARAMS_PER_COMMAND,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Walks the Cartesian product of values lazily, rendering each combination on top of fixed.
+
+    Yields a "command" event the first time an output is seen, then once the walk ends a "group" event
+    per command with every parameter set (up to max_params) that produced it, and a "summary".
+    """
+    names = list(values)
+    seen: Dict[str, int] = {}
+    groups: List[Dict[str, Any]] = []
+    walked = 0
+    truncated = False
+
+    for combo in itertools.product(*(values[n] for n in names)):
+        if walked >= max_combinations:
+            truncated = True
+            break
+        walked += 1
+
+        params = dict(zip(names, combo))
+        try:
+            output = render(cls, sub, {**fixed, **params})
+            key, event = f"command:{output}", {"command": output}
+        except Exception as e:
+            key, event = f"error:{e}", {"error": str(e)}
+
+        idx = seen.get(key)
+        if idx is None:
+            if len(seen) >= max_distinct:
+                truncated = True
+                break
+            idx = seen[key] = len(groups)
+            groups.append({"count": 0, "params": []})
+            yield {"type": "command", "id": idx, **event, "params": params}
+
+        group = groups[idx]
+        group["count"] += 1
+        if len(group["params"]) < max_params:
+            group["params"].append(params)
+
+    for idx, group in enumerate(groups):
+        yield {"type": "group", "id": idx, **group}
+    yield {
+        "type": "summary",
+        "combinations": walked,
+        "distinct": len(groups),
+        "truncated": truncated,
+    }
+
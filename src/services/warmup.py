@@ -0,0 +1,92 @@
+import statistics
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+from connectors.base import Module
+from services.cache import PreviewCache
+from services.parser import build_connector_description
+from services.render import render
+
+_REPORT = None
+
+
+def _form_value(field: Dict[str, Any]) -> Any:
+    # mirrors what app.js collectFormData sends for an untouched field
+    if field["type"] == "bool":
+        return bool(field["default"])
+    value = field["default"]
+    if not value:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def form_defaults(globals_: List[Dict[str, Any]], extras: List[Dict[str, Any]]) -> Dict[str, Any]:
+    data = {}
+    for field in globals_ + extras:
+        value = _form_value(field)
+        if value is not None:
+            data[field["name"]] = value
+    return data
+
+
+def _render_one(cls: Type[Module], sub: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        result = {"output": render(cls, sub, data)}
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    result["ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def warm_up(
+    connectors: Dict[str, Type[Module]],
+    cache: Optional[PreviewCache] = None,
+    workers: int = 4,
+    slow_ms: float = 50.0,
+) -> Dict[str, Any]:
+    global _REPORT
+    desc = build_connector_description(connectors)
+
+    jobs = []
+    for name, cls in connectors.items():
+        for sub in desc[name]["subs"]:
+            data = form_defaults(desc[name]["globals"], sub["extras"])
+            jobs.append((name, cls, sub["key"], data))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_one, cls, sub, data) for _, cls, sub, data in jobs]
+        results = []
+        for (name, _, sub, data), future in zip(jobs, futures):
+            result = {"connector": name, "sub": sub, **future.result()}
+            results.append(result)
+            if cache is not None and "output" in result:
+                cache.put(cache.key(name, sub, data), result["output"])
+
+    times = [r["ms"] for r in results]
+    # anything above slow_ms, or an order of magnitude above the median (1ms floor), is an outlier
+    threshold = min(slow_ms, max(1.0, statistics.median(times) * 10)) if times else slow_ms
+    _REPORT = {
+        "total_ms": (time.perf_counter() - start) * 1000,
+        "rendered": len(results),
+        "failed": [r for r in results if "error" in r],
+        "slow": [r for r in results if r["ms"] > threshold and "error" not in r],
+        "results": results,
+    }
+    return _REPORT
+
+
+def print_report(report: Dict[str, Any], printer: callable = print) -> None:
+    printer(f"+ warm-up rendered {report['rendered']} submodules in {report['total_ms']:.1f}ms")
+    for r in report["failed"]:
+        printer(f"- FAILED {r['connector']} / {r['sub']}: {r['error']}")
+    for r in report["slow"]:
+        printer(f"- SLOW   {r['connector']} / {r['sub']}: {r['ms']:.1f}ms")
+
+
+def get_report() -> Optional[Dict[str, Any]]:
+    return _REPORT
@@ -0,0 +1,282 @@
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type
+from connectors.base import Module
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+NDJSON = "application/x-ndjson"
+
+# accepted spellings of each media type
+_ALIASES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonlines": NDJSON,
+}
+
+
+class WireError(ValueError):
+    pass
+
+
+def _pack(obj: Any, out: bytearray) -> None:
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -0x20 <= obj < 0:
+            out.append(obj & 0xff)
+        elif -(1 << 63) <= obj < 0:
+            out += b"\xd3" + struct.pack(">q", obj)
+        elif obj < (1 << 64):
+            out += b"\xcf" + struct.pack(">Q", obj)
+        else:
+            raise WireError("integer too large for msgpack")
+    elif isinstance(obj, float):
+        out += b"\xcb" + struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(0xa0 | n)
+        elif n < 0x100:
+            out += b"\xd9" + struct.pack(">B", n)
+        elif n < 0x10000:
+            out += b"\xda" + struct.pack(">H", n)
+        else:
+            out += b"\xdb" + struct.pack(">I", n)
+        out += data
+    elif isinstance(obj, (bytes, bytearray)):
+        n = len(obj)
+        if n < 0x100:
+            out += b"\xc4" + struct.pack(">B", n)
+        elif n < 0x10000:
+            out += b"\xc5" + struct.pack(">H", n)
+        else:
+            out += b"\xc6" + struct.pack(">I", n)
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n < 0x10000:
+            out += b"\xdc" + struct.pack(">H", n)
+        else:
+            out += b"\xdd" + struct.pack(">I", n)
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, Mapping):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n < 0x10000:
+            out += b"\xde" + struct.pack(">H", n)
+        else:
+            out += b"\xdf" + struct.pack(">I", n)
+        for k, v in obj.items():
+            _pack(k, out)
+            _pack(v, out)
+    else:
+        _pack(str(obj), out)
+
+
+# fixed-width formats: marker -> (struct format, size)
+_FIXED = {
+    0xca: (">f", 4), 0xcb: (">d", 8),
+    0xcc: (">B", 1), 0xcd: (">H", 2), 0xce: (">I", 4), 0xcf: (">Q", 8),
+    0xd0: (">b", 1), 0xd1: (">h", 2), 0xd2: (">i", 4), 0xd3: (">q", 8),
+}
+# variable-width formats: marker -> (kind, length format, length size)
+_SIZED = {
+    0xd9: ("str", ">B", 1), 0xda: ("str", ">H", 2), 0xdb: ("str", ">I", 4),
+    0xc4: ("bin", ">B", 1), 0xc5: ("bin", ">H", 2), 0xc6: ("bin", ">I", 4),
+    0xdc: ("array", ">H", 2), 0xdd: ("array", ">I", 4),
+    0xde: ("map", ">H", 2), 0xdf: ("map", ">I", 4),
+}
+
+
+def _unpack(data: bytes, pos: int) -> Tuple[Any, int]:
+    try:
+        b = data[pos]
+    except IndexError:
+        raise WireError("truncated msgpack data")
+    pos += 1
+
+    if b < 0x80:
+        return b, pos
+    if b >= 0xe0:
+        return b - 0x100, pos
+    if b == 0xc0:
+        return None, pos
+    if b == 0xc2:
+        return False, pos
+    if b == 0xc3:
+        return True, pos
+
+    if b in _FIXED:
+        fmt, size = _FIXED[b]
+        if pos + size > len(data):
+            raise WireError("truncated msgpack data")
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+
+    if 0xa0 <= b <= 0xbf:
+        kind, n = "str", b & 0x1f
+    elif 0x90 <= b <= 0x9f:
+        kind, n = "array", b & 0x0f
+    elif 0x80 <= b <= 0x8f:
+        kind, n = "map", b & 0x0f
+    elif b in _SIZED:
+        kind, fmt, size = _SIZED[b]
+        if pos + size > len(data):
+            raise WireError("truncated msgpack data")
+        n = struct.unpack_from(fmt, data, pos)[0]
+        pos += size
+    else:
+        raise WireError(f"unsupported msgpack type 0x{b:02x}")
+
+    if kind in ("str", "bin"):
+        if pos + n > len(data):
+            raise WireError("truncated msgpack data")
+        raw = data[pos:pos + n]
+        if kind == "bin":
+            return bytes(raw), pos + n
+        try:
+            return raw.decode("utf-8"), pos + n
+        except UnicodeDecodeError as e:
+            raise WireError(str(e))
+    if kind == "array":
+        items = []
+        for _ in range(n):
+            item, pos = _unpack(data, pos)
+            items.append(item)
+        return items, pos
+
+    result = {}
+    for _ in range(n):
+        k, pos = _unpack(data, pos)
+        v, pos = _unpack(data, pos)
+        try:
+            result[k] = v
+        except TypeError:
+            # a map or array used as a key
+            raise WireError(f"unhashable msgpack map key of type {type(k).__name__}")
+    return result, pos
+
+
+def packb(obj: Any) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True, default=str)
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+def unpackb(data: bytes) -> Any:
+    if msgpack is not None:
+        try:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        except (ValueError, TypeError, msgpack.ExtraData) as e:
+            raise WireError(str(e))
+    try:
+        obj, pos = _unpack(data, 0)
+    except RecursionError:
+        raise WireError("msgpack data nested too deeply")
+    if pos != len(data):
+        raise WireError("trailing bytes after msgpack data")
+    return obj
+
+
+def media_type(header: Optional[str]) -> Optional[str]:
+    if not header:
+        return None
+    return _ALIASES.get(header.split(";")[0].strip().lower())
+
+
+def negotiate(accept: Optional[str], offered: Iterable[str], default: str = JSON) -> str:
+    """Picks the response media type: the highest-q accepted type we offer, default otherwise."""
+    offered = list(offered)
+    best, best_q = default, -1.0
+    for part in (accept or "").split(","):
+        fields = part.split(";")
+        mt = _ALIASES.get(fields[0].strip().lower())
+        if mt not in offered:
+            continue
+        q = 1.0
+        for f in fields[1:]:
+            k, _, v = f.strip().partition("=")
+            if k == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        if q > best_q and q > 0:
+            best, best_q = mt, q
+    return best
+
+
+def decode(body: bytes, content_type: Optional[str]) -> Any:
+    mt = media_type(content_type) or JSON
+    if mt == MSGPACK:
+        return unpackb(body)
+    try:
+        if mt == NDJSON:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        return json.loads(body) if body else None
+    except ValueError as e:
+        raise WireError(str(e))
+    except RecursionError:
+        raise WireError("JSON data nested too deeply")
+
+
+def encode(obj: Any, mt: str) -> bytes:
+    if mt == MSGPACK:
+        return packb(obj)
+    return json.dumps(obj, default=str).encode()
+
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    for item in items:
+        yield json.dumps(item, default=str).encode() + b"\n"
+
+
+def schema_ids(connectors: Mapping[str, Type[Module]]) -> List[Dict[str, Any]]:
+    """Numeric ids for connectors and submodules, by position in the loaded catalogue."""
+    return [
+        {"id": i, "name": name, "subs": [{"id": j, "key": key} for j, key in enumerate(_sub_keys(connectors, name))]}
+        for i, name in enumerate(connectors)
+    ]
+
+
+def _sub_keys(connectors: Mapping[str, Type[Module]], name: str) -> List[str]:
+    is_loaded = getattr(connectors, "is_loaded", lambda name: True)
+    stored = connectors.description(name) if not is_loaded(name) else None
+    if stored is not None:
+        return [sub["key"] for sub in stored["subs"]]
+    return list(connectors[name].sub_modules)
+
+
+def resolve_ids(connectors: Mapping[str, Type[Module]], name: Any, sub: Any) -> Tuple[Any, Any]:
+    """Maps numeric __connector/__sub ids to names, leaving names untouched."""
+    if isinstance(name, int) and not isinstance(name, bool):
+        names = list(connectors)
+        if not 0 <= name < len(names):
+            return None, sub
+        name = names[name]
+    if isinstance(sub, int) and not isinstance(sub, bool) and name in connectors:
+        keys = list(connectors[name].sub_modules)
+        sub = keys[sub] if 0 <= sub < len(keys) else None
+    return name, sub
@@ -5,9 +5,30 @@ const state = {
         extras: { x: 0, y: 0 },
         preview: { x: 0, y: 0 }
     },
-    zIndexCounter: 100
+    zIndexCounter: 100,
+    query: '',
+    rows: [],
+    collapsed: new Set(),
+    renderedRows: new Map(),
+    formCache: { globals: new Map(), extras: new Map() },
+    // server-held globals (/profiles), so previews only carry the profile id, the extras and changed globals
+    profile: { id: null, values: {}, pending: null }
 };
 
+// keep in sync with the row height in style.css
+const ROW_HEIGHT = 40;
+const OVERSCAN = 10;
+
+// a static export (scripts/build-static.py) renders compiled templates locally and may have no server at all
+const previewUrl = staticBuild ? staticBuild.previewUrl : '/preview';
+const docCache = new Map();
+
+const catalogue = Object.keys(connectors).map(name => ({
+    name,
+    lower: name.toLowerCase(),
+    subs: (connectors[name].subs || []).map(s => ({ key: s.key, lower: s.key.toLowerCase() }))
+}));
+
 const elements = {
     menu: document.getElementById('menu'),
     globalsW: document.getElementById('globals'),
@@ -79,61 +100,96 @@ const storage = {
     }
 };
 
-const buildMenu = (query = '') => {
-    elements.menu.innerHTML = '';
+const buildMenu = (query = state.query) => {
+    state.query = query;
     const lowerCaseQuery = query.toLowerCase();
+    const rows = [];
 
-    Object.keys(connectors).forEach(name => {
-        const isModuleMatch = name.toLowerCase().includes(lowerCaseQuery);
-        const matchingSubs = connectors?.[name]?.subs
-            ?.filter(s => s.key.toLowerCase().includes(lowerCaseQuery)) || [];
+    catalogue.forEach(c => {
+        const isModuleMatch = c.lower.includes(lowerCaseQuery);
+        const matchingSubs = query ? c.subs.filter(s => s.lower.includes(lowerCaseQuery)) : c.subs;
 
-        if (isModuleMatch || matchingSubs.length > 0) {
-            const head = createMenuHeader(name);
-            const subList = createSubList(name, query ? matchingSubs : connectors?.[name]?.subs || []);
+        if (!isModuleMatch && matchingSubs.length === 0) return;
 
-            elements.menu.appendChild(head);
-            elements.menu.appendChild(subList);
-        }
+        rows.push({ id: `h:${c.name}`, name: c.name });
+        if (state.collapsed.has(c.name)) return;
+        matchingSubs.forEach(s => rows.push({ id: `s:${c.name}:${s.key}`, name: c.name, sub: s.key }));
     });
-};
 
-const createMenuHeader = (name) => {
-    const head = document.createElement('li');
-    head.className = 'heading active';
-    head.textContent = name;
-    head.onclick = () => head.classList.toggle('active');
-    return head;
+    state.rows = rows;
+    elements.menu.style.height = `${rows.length * ROW_HEIGHT}px`;
+    renderMenuWindow();
 };
 
-const createSubList = (name, subs) => {
-    const subList = document.createElement('ul');
-    subList.className = 'sub-list';
+const renderMenuWindow = () => {
+    const nav = elements.menu.parentElement;
+    const top = nav.scrollTop - elements.menu.offsetTop;
+    const first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+    const last = Math.min(state.rows.length, Math.ceil((top + nav.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+
+    const visible = new Set();
+    for (let i = first; i < last; i++) {
+        const row = state.rows[i];
+        visible.add(row.id);
+
+        let li = state.renderedRows.get(row.id);
+        if (!li) {
+            li = createMenuRow(row);
+            state.renderedRows.set(row.id, li);
+            elements.menu.appendChild(li);
+        }
+
+        li.style.transform = `translateY(${i * ROW_HEIGHT}px)`;
+        li.classList.toggle('active', row.sub === undefined
+            ? !state.collapsed.has(row.name)
+            : row.name === state.current.name && row.sub === state.current.sub);
+    }
 
-    subs.forEach(s => {
-        const li = document.createElement('li');
-        li.className = 'sub';
-        li.textContent = s.key;
-        li.dataset.connector = name;
-        li.dataset.sub = s.key;
-        li.onclick = () => selectSub(name, s.key);
-        subList.appendChild(li);
+    state.renderedRows.forEach((li, id) => {
+        if (!visible.has(id)) {
+            li.remove();
+            state.renderedRows.delete(id);
+        }
     });
+};
+
+const createMenuRow = (row) => {
+    const li = document.createElement('li');
+    li.dataset.connector = row.name;
 
-    return subList;
+    if (row.sub === undefined) {
+        li.className = 'heading';
+        li.textContent = row.name;
+    } else {
+        li.className = 'sub';
+        li.textContent = row.sub;
+        li.dataset.sub = row.sub;
+    }
+    return li;
 };
 
-const selectSub = (name, sub) => {
-    document.querySelectorAll('li.sub')
-        .forEach(e => e.classList.remove('active'));
+const onMenuClick = (e) => {
+    const li = e.target.closest('li');
+    if (!li) return;
 
-    const el = document.querySelector(
-        `li.sub[data-connector="${name}"][data-sub="${sub}"]`
-    );
-    el?.classList.add('active');
+    const { connector, sub } = li.dataset;
+    if (sub !== undefined) {
+        selectSub(connector, sub);
+        return;
+    }
+
+    if (state.collapsed.has(connector)) {
+        state.collapsed.delete(connector);
+    } else {
+        state.collapsed.add(connector);
+    }
+    buildMenu();
+};
 
+const selectSub = (name, sub) => {
     const prevConnector = state.current.name;
     state.current = { name, sub };
+    renderMenuWindow();
 
     localStorage.setItem('lastSelectedSub', JSON.stringify(state.current));
 
@@ -146,11 +202,24 @@ const selectSub = (name, sub) => {
     if (subModule && subModule.doc) {
         elements.docContent.innerHTML = subModule.doc;
         elements.docW.style.display = '';
+    } else if (subModule && subModule.doc_url) {
+        showDocFrom(subModule.doc_url, name, sub);
     } else {
         elements.docW.style.display = 'none';
     }
 };
 
+const showDocFrom = async (url, name, sub) => {
+    if (!docCache.has(url)) {
+        docCache.set(url, fetch(url).then(res => res.ok ? res.text() : ''));
+    }
+    const html = await docCache.get(url).catch(() => '');
+    if (state.current.name !== name || state.current.sub !== sub) return;
+
+    elements.docContent.innerHTML = html;
+    elements.docW.style.display = html ? '' : 'none';
+};
+
 const resetContainerPositions = () => {
     state.containerPositions = {
         globals: { x: 0, y: 0 },
@@ -166,20 +235,16 @@ const resetContainerPositions = () => {
 };
 
 const buildGlobals = (name) => {
-    elements.formG.innerHTML = '';
     const globs = connectors?.[name]?.globals || [];
-    const savedState = storage.load();
 
     if (!globs.length) {
+        elements.formG.replaceChildren();
         elements.globalsW.style.display = 'none';
         return;
     }
 
     elements.globalsW.style.display = '';
-    globs.forEach(f => {
-        const fieldHtml = createFieldHtml(f, savedState);
-        elements.formG.insertAdjacentHTML('beforeend', fieldHtml);
-    });
+    mountFields(elements.formG, state.formCache.globals, name, globs);
 
     elements.formG.oninput = () => {
         storage.save();
@@ -188,21 +253,17 @@ const buildGlobals = (name) => {
 };
 
 const buildExtras = (name, sub) => {
-    elements.formE.innerHTML = '';
     const extra = connectors?.[name]?.subs
         ?.find(s => s.key === sub)?.extras || [];
-    const savedState = storage.load();
 
     if (!extra.length) {
+        elements.formE.replaceChildren();
         elements.extrasW.style.display = 'none';
         return;
     }
 
     elements.extrasW.style.display = '';
-    extra.forEach(f => {
-        const fieldHtml = createFieldHtml(f, savedState);
-        elements.formE.insertAdjacentHTML('beforeend', fieldHtml);
-    });
+    mountFields(elements.formE, state.formCache.extras, `${name}:${sub}`, extra);
 
     elements.formE.oninput = () => {
         storage.save();
@@ -210,6 +271,29 @@ const buildExtras = (name, sub) => {
     };
 };
 
+// form fields are built once per connector/submodule and re-attached on later selections
+const mountFields = (form, cache, key, fields) => {
+    let fragment = cache.get(key);
+    if (!fragment) {
+        fragment = document.createElement('div');
+        fragment.innerHTML = fields.map(f => createFieldHtml(f)).join('');
+        cache.set(key, fragment);
+    }
+
+    const savedState = storage.load();
+    fragment.querySelectorAll('input').forEach(input => {
+        const savedValue = savedState[input.name];
+        if (savedValue === undefined) return;
+        if (input.type === 'checkbox') {
+            input.checked = !!savedValue;
+        } else {
+            input.value = savedValue;
+        }
+    });
+
+    if (form.firstChild !== fragment) form.replaceChildren(fragment);
+};
+
 const createFieldHtml = (field, savedValues = {}) => {
     const savedValue = savedValues[field.name];
 
@@ -262,19 +346,160 @@ const collectFormData = () => {
     return data;
 };
 
-const updatePreview = async () => {
-    if (!state.current.name) return;
+// same pattern as _NUMBER in connectors/base.py, Number() alone also takes ' ', '0x10' and 'Infinity'
+const NUMBER = /^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?$/;
+
+// mirrors the Constraint classes in connectors/base.py
+const constraintChecks = {
+    exclusive: (c, v) => c.params.filter(p => v[p]).length <= 1,
+    one_of: (c, v) => c.params.filter(p => v[p]).length === 1,
+    requires: (c, v) => !v[c.params[0]] || c.params.slice(1).every(p => v[p]),
+    range: (c, v) => {
+        const value = v[c.params[0]];
+        if (value === undefined || value === null || value === '' || typeof value === 'boolean') return true;
+        if (!NUMBER.test(String(value))) return false;
+        const n = Number(value);
+        return (c.min === null || n >= c.min) && (c.max === null || n <= c.max);
+    },
+    pattern: (c, v) => {
+        const value = v[c.params[0]];
+        if (value === undefined || value === null || value === '' || typeof value === 'boolean') return true;
+        return new RegExp(`^(?:${c.pattern})$`).test(String(value));
+    }
+};
 
-    elements.previewContent.value = elements.previewContent.value;
+const constraintErrors = (data) => {
+    const connector = connectors?.[data.__connector];
+    const sub = connector?.subs?.find(s => s.key === data.__sub);
+    if (!sub?.constraints?.length) return [];
 
-    try {
-        const res = await fetch('/preview', {
+    // unsent fields fall back to their declared defaults, as they do on the server
+    const values = {};
+    [...connector.globals, ...sub.extras].forEach(f => { values[f.name] = f.default; });
+    Object.assign(values, data);
+
+    return sub.constraints
+        .filter(c => constraintChecks[c.type] && !constraintChecks[c.type](c, values))
+        .map(c => c.message);
+};
+
+const profilesEnabled = !staticBuild;
+
+const currentGlobals = (data) => {
+    const globals = {};
+    (connectors?.[data.__connector]?.globals || []).forEach(f => {
+        if (data[f.name] !== undefined) globals[f.name] = data[f.name];
+    });
+    return globals;
+};
+
+// created once with the current globals, later changes ride along with the previews
+const ensureProfile = (data) => {
+    const p = state.profile;
+    if (p.id) return Promise.resolve(p.id);
+    if (!p.pending) {
+        const globals = currentGlobals(data);
+        p.pending = fetch('/profiles', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(collectFormData())
-        });
+            body: JSON.stringify(globals)
+        })
+            .then(res => res.ok ? res.json() : null)
+            .catch(() => null)
+            .then(profile => {
+                p.pending = null;
+                if (profile) {
+                    p.id = profile.id;
+                    p.values = globals;
+                    localStorage.setItem('profileId', p.id);
+                }
+                return p.id;
+            });
+    }
+    return p.pending;
+};
+
+// the preview body and the global changes it carries, null resets a global to its default
+const previewBody = async (data) => {
+    if (!profilesEnabled) return [data, null];
+
+    const id = await ensureProfile(data);
+    if (!id) return [data, null];
+
+    const globals = new Set((connectors?.[data.__connector]?.globals || []).map(f => f.name));
+    const changes = {};
+    globals.forEach(name => {
+        const value = data[name] === undefined ? null : data[name];
+        if ((state.profile.values[name] ?? null) !== value) changes[name] = value;
+    });
+
+    const body = { __profile: id, ...changes };
+    Object.entries(data).forEach(([k, v]) => {
+        if (!globals.has(k)) body[k] = v;
+    });
+    return [body, changes];
+};
+
+const renderLocally = (data) => {
+    const t = window.syntacTemplates?.[data.__connector]?.[data.__sub];
+    if (!t) return undefined;
+
+    const present = (i) => t.bools[i] ? !!data[t.params[i]] : data[t.params[i]] !== undefined;
+    const key = t.dims.reduce((acc, i, k) => present(i) ? acc | (1 << k) : acc, 0);
 
-        const js = await res.json();
+    return t.templates[t.index[key]]
+        .map(s => typeof s === 'string'
+            ? s
+            : (data[t.params[s]] !== undefined ? String(data[t.params[s]]) : t.defaults[s]))
+        .join('');
+};
+
+const updatePreview = async () => {
+    if (!state.current.name) return;
+
+    const data = collectFormData();
+    const errors = constraintErrors(data);
+    if (errors.length) {
+        elements.previewContent.value = errors.join('; ');
+        return;
+    }
+
+    const local = renderLocally(data);
+    if (local !== undefined) {
+        elements.previewContent.value = local;
+        return;
+    }
+
+    if (!previewUrl) {
+        elements.previewContent.value = 'This sub-module can only be previewed by a Syntac server.';
+        return;
+    }
+
+    try {
+        const send = async (body) => {
+            const res = await fetch(previewUrl, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(body)
+            });
+            return [res.status, await res.json()];
+        };
+
+        let [body, changes] = await previewBody(data);
+        let [status, js] = await send(body);
+        if (status === 404 && js.error === 'unknown profile') {
+            // evicted or the server restarted, start a new profile
+            state.profile.id = null;
+            state.profile.values = {};
+            [body, changes] = await previewBody(data);
+            [status, js] = await send(body);
+        }
+        if (changes && status !== 404) {
+            Object.entries(changes).forEach(([k, v]) => {
+                if (v === null) delete state.profile.values[k];
+                else state.profile.values[k] = v;
+            });
+        }
         elements.previewContent.value = js.command || js.error;
     } catch (e) {
         elements.previewContent.value = e.message;
@@ -283,6 +508,8 @@ const updatePreview = async () => {
 
 const init = () => {
     initDraggable();
+    // the server's copy is unknown after a reload, so the first sync resends every global
+    if (profilesEnabled) state.profile.id = localStorage.getItem('profileId');
     buildMenu();
   
     const lastSelected = localStorage.getItem('lastSelectedSub');
@@ -296,6 +523,17 @@ const init = () => {
     elements.searchBox.addEventListener('input', (e) => {
         buildMenu(e.target.value);
     });
+
+    let scrollFrame = null;
+    elements.menu.parentElement.addEventListener('scroll', () => {
+        if (scrollFrame) return;
+        scrollFrame = requestAnimationFrame(() => {
+            scrollFrame = null;
+            renderMenuWindow();
+        });
+    });
+    window.addEventListener('resize', renderMenuWindow);
+    elements.menu.addEventListener('click', onMenuClick);
   };
 
 document.addEventListener('DOMContentLoaded', init);
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+import zipfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from services.inventory import Inventory, import_bloodhound
+
+
+USERS = {
+    "data": [
+        {
+            "ObjectIdentifier": "S-1-5-21-1-1104",
+            "PrimaryGroupSID": "S-1-5-21-1-513",
+            "AllowedToDelegate": [],
+            "SPNTargets": [],
+            "HasSIDHistory": [],
+            "Properties": {"name": "ALICE@CORP.LOCAL", "domain": "CORP.LOCAL", "enabled": True},
+        },
+    ],
+    "meta": {"type": "users", "count": 1, "version": 5},
+}
+
+COMPUTERS = {
+    "data": [
+        {
+            "ObjectIdentifier": "S-1-5-21-1-1000",
+            "PrimaryGroupSID": "S-1-5-21-1-516",
+            "LocalAdmins": {"Results": [], "Collected": False},
+            "Sessions": {"Results": [], "Collected": False},
+            "Properties": {"name": "DC01.CORP.LOCAL", "domain": "CORP.LOCAL", "operatingsystem": "Windows Server 2019"},
+        },
+        {
+            "ObjectIdentifier": "S-1-5-21-1-1105",
+            "PrimaryGroupSID": "S-1-5-21-1-515",
+            "LocalAdmins": {"Results": [], "Collected": False},
+            "Properties": {"name": "WS01.CORP.LOCAL", "domain": "CORP.LOCAL"},
+        },
+    ],
+    "meta": {"type": "computers", "count": 2, "version": 5},
+}
+
+
+def _write(path, doc):
+    with open(path, "w") as f:
+        json.dump(doc, f)
+    return str(path)
+
+
+def test_users_are_not_hosts(tmp_path):
+    inventory = Inventory()
+    assert import_bloodhound(_write(tmp_path / "users.json", USERS), inventory) == 0
+    assert len(inventory) == 0
+
+
+def test_computers_become_hosts(tmp_path):
+    inventory = Inventory()
+    assert import_bloodhound(_write(tmp_path / "computers.json", COMPUTERS), inventory) == 2
+    assert sorted(inventory.hosts) == ["dc01.corp.local", "ws01.corp.local"]
+    assert [h.address for h in inventory.select(role="dc")] == ["dc01.corp.local"]
+    assert inventory.domains == {"corp.local"}
+
+
+def test_collection_zip_only_imports_computers(tmp_path):
+    path = tmp_path / "collection.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("20240101_users.json", json.dumps(USERS))
+        zf.writestr("20240101_computers.json", json.dumps(COMPUTERS))
+
+    inventory = Inventory()
+    assert import_bloodhound(str(path), inventory) == 2
+    assert "alice@corp.local" not in inventory.hosts
+    assert inventory.summary()["hosts"] == 2